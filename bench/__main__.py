@@ -0,0 +1,43 @@
+import argparse
+import sys
+
+from . import micro, scenarios  # noqa: F401
+from .harness import compare, load, run_benchmarks, save
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m bench", description="Space rush! benchmarks"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run benchmarks")
+    run_parser.add_argument("-k", "--filter", default="", help="name substring")
+    run_parser.add_argument("--kind", choices=["micro", "scenario"])
+    run_parser.add_argument("-r", "--repeat", type=int, default=5)
+    run_parser.add_argument("-o", "--output", default="bench_results.json")
+
+    compare_parser = commands.add_parser("compare", help="compare with baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument(
+        "-t", "--threshold", type=float, default=10.0, help="allowed slowdown, %%"
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        save(run_benchmarks(args.filter, args.kind, args.repeat), args.output)
+        return 0
+
+    regressions = compare(load(args.baseline), load(args.current), args.threshold)
+
+    if regressions:
+        print("{} benchmark(s) regressed".format(len(regressions)))
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
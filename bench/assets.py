@@ -0,0 +1,12 @@
+from .harness import make_game
+
+
+def main() -> None:
+    game = make_game(measure_assets=True)
+
+    print(game.get_assets_report())
+    print(game.get_atlas_report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import argparse
+import random
+import sys
+import time
+
+from typing import Dict, List, Tuple
+
+import pygame
+
+from core.game import Game
+
+from .harness import SEED, make_game
+
+FPS = 60
+
+
+def _snapshot(game: Game) -> Tuple:
+    """Get gameplay outcome of the tick, images are not compared"""
+
+    return (
+        game._score,
+        game._health,
+        game._player.lives,
+        tuple(game._player.rect),
+        tuple((tuple(mob.rect), mob.rot) for mob in game._mobs),
+        tuple(tuple(bullet.rect) for bullet in game._bullets),
+        tuple((powerup.type, tuple(powerup.rect)) for powerup in game._powerups),
+        len(game._explosion_sprites),
+    )
+
+
+def replay(
+    culling: bool, mobs: int, ticks: int, seed: int = SEED
+) -> Tuple[List[Tuple], float, Dict[str, object]]:
+    """Play scripted game, return snapshots, seconds per tick and culling stats
+
+    Game clock is advanced by the frame time every tick and the player
+    input comes from its own seeded random, so the replays are the same
+    as long as culling does not change the outcomes.
+    """
+
+    clock = [0]
+    get_ticks = pygame.time.get_ticks
+    pygame.time.get_ticks = lambda: clock[0]
+
+    try:
+        game = make_game(
+            mobs, seed, is_god_mode=False, restart_on_game_over=True, culling=culling
+        )
+        script = random.Random(seed)
+
+        snapshots: List[Tuple] = []
+        elapsed = 0.0
+
+        for _ in range(ticks):
+            clock[0] += 1000 // FPS
+
+            game._player.rect.x += script.choice((-8, 0, 8))
+
+            if script.random() < 0.3:
+                game._shoot(script.choice(["left", "right"]))
+
+            started = time.perf_counter()
+            game.step()
+            elapsed += time.perf_counter() - started
+
+            snapshots.append(_snapshot(game))
+
+        stats = game.get_culling_stats()
+        game._renderer.close()
+    finally:
+        pygame.time.get_ticks = get_ticks
+
+    return snapshots, elapsed / ticks, stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m bench.culling",
+        description="Check that culling does not change the gameplay",
+    )
+    parser.add_argument("-m", "--mobs", type=int, default=200)
+    parser.add_argument("-t", "--ticks", type=int, default=1200)
+    parser.add_argument("-s", "--seed", type=int, default=SEED)
+    args = parser.parse_args()
+
+    plain, plain_time, _ = replay(False, args.mobs, args.ticks, args.seed)
+    culled, culled_time, stats = replay(True, args.mobs, args.ticks, args.seed)
+
+    print("no culling {:>10.1f} us/tick".format(plain_time * 1e6))
+    print(
+        "culling    {:>10.1f} us/tick, culled per tick: draw {:.1f}, "
+        "collision {:.1f}".format(
+            culled_time * 1e6, stats["mean"]["draw"], stats["mean"]["collision"]
+        )
+    )
+
+    for tick, (expected, actual) in enumerate(zip(plain, culled)):
+        if expected != actual:
+            print("outcomes differ at tick {}".format(tick))
+            sys.exit(1)
+
+    print("outcomes match for {} ticks".format(args.ticks))
+
+
+if __name__ == "__main__":
+    main()
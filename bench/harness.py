@@ -0,0 +1,201 @@
+import json
+import os
+import platform
+import random
+import statistics
+import time
+
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame  # noqa: E402
+
+from core.game import Game  # noqa: E402
+
+SEED = 1337
+
+
+@dataclass
+class Case:
+    """Benchmark case
+
+    run is timed, setup is called before every repeat outside the timer,
+    ops is the number of operations done by one run.
+    """
+
+    run: Callable[[], None]
+    setup: Optional[Callable[[], None]] = None
+    ops: int = 1
+
+
+@dataclass
+class Benchmark:
+    """Registered benchmark"""
+
+    name: str
+    factory: Callable[[Game, int], Case]
+    counts: Tuple[int, ...]
+    kind: str
+    mobs_count: int = 10
+    renderer: str = "surface"
+
+
+BENCHMARKS: List[Benchmark] = []
+
+
+def benchmark(
+    name: str,
+    counts: Tuple[int, ...] = (1,),
+    kind: str = "micro",
+    mobs_count: int = 10,
+    renderers: Tuple[str, ...] = ("surface",),
+):
+    """Register benchmark case factory
+
+    Benchmarks with several renderers are registered once per renderer,
+    the name of the non default ones gets the renderer suffix.
+    """
+
+    def decorator(factory: Callable[[Game, int], Case]):
+        for renderer in renderers:
+            BENCHMARKS.append(
+                Benchmark(
+                    name if renderer == "surface" else "{}@{}".format(name, renderer),
+                    factory,
+                    counts,
+                    kind,
+                    mobs_count,
+                    renderer,
+                )
+            )
+
+        return factory
+
+    return decorator
+
+
+def make_game(
+    mobs_count: int = 10, seed: int = SEED, renderer: str = "surface", **options
+) -> Game:
+    """Create headless game with seeded random
+
+    options are passed to the game and override the defaults.
+    """
+
+    random.seed(seed)
+
+    return Game(
+        1000,
+        800,
+        "Space rush! bench",
+        60,
+        mobs_count,
+        **{"is_god_mode": True, "renderer": renderer, **options},
+    )
+
+
+def measure(case: Case, repeat: int) -> Dict[str, float]:
+    """Time the case, return stats in microseconds per op"""
+
+    samples: List[float] = []
+
+    for _ in range(repeat):
+        if case.setup:
+            case.setup()
+
+        started = time.perf_counter()
+        case.run()
+        samples.append((time.perf_counter() - started) / case.ops * 1e6)
+
+    return {
+        "min_us": min(samples),
+        "median_us": statistics.median(samples),
+        "mean_us": statistics.fmean(samples),
+        "repeat": repeat,
+        "ops": case.ops,
+    }
+
+
+def run_benchmarks(
+    name_filter: str = "", kind: Optional[str] = None, repeat: int = 5
+) -> Dict[str, object]:
+    """Run registered benchmarks, return machine readable results"""
+
+    results: Dict[str, Dict[str, float]] = {}
+
+    for bench in BENCHMARKS:
+        if name_filter not in bench.name or (kind and bench.kind != kind):
+            continue
+
+        for count in bench.counts:
+            name = "{}[{}]".format(bench.name, count)
+
+            game = make_game(bench.mobs_count, renderer=bench.renderer)
+            random.seed(SEED)
+
+            results[name] = measure(bench.factory(game, count), repeat)
+            game._renderer.close()
+
+            print("{:<48} {:>12.1f} us".format(name, results[name]["median_us"]))
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "seed": SEED,
+        },
+        "results": results,
+    }
+
+
+def save(results: Dict[str, object], path: str) -> None:
+    """Save results to the json file"""
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+
+def load(path: str) -> Dict[str, object]:
+    """Load results from the json file"""
+
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(
+    baseline: Dict[str, object], current: Dict[str, object], threshold: float
+) -> List[str]:
+    """Compare median times, return names of regressed benchmarks
+
+    threshold is allowed slowdown in percents.
+    """
+
+    regressions: List[str] = []
+
+    for name, result in sorted(current["results"].items()):
+        base = baseline["results"].get(name)
+
+        if base is None:
+            print("{:<48} {:>12} new".format(name, "-"))
+            continue
+
+        change = (result["median_us"] / base["median_us"] - 1) * 100
+        is_regression = change > threshold
+
+        if is_regression:
+            regressions.append(name)
+
+        print(
+            "{:<48} {:>12.1f} us {:>+8.1f}%{}".format(
+                name,
+                result["median_us"],
+                change,
+                "  REGRESSION" if is_regression else "",
+            )
+        )
+
+    return regressions
@@ -0,0 +1,28 @@
+import argparse
+
+from .harness import make_game
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m bench.memory", description="Dump surface memory holders"
+    )
+    parser.add_argument("-m", "--mobs", type=int, default=10)
+    parser.add_argument("-t", "--ticks", type=int, default=600)
+    parser.add_argument("-b", "--budget-kib", type=int, help="memory budget")
+    parser.add_argument("-n", "--top", type=int, default=20)
+    args = parser.parse_args()
+
+    game = make_game(args.mobs)
+
+    if args.budget_kib:
+        game._memory.budget = args.budget_kib * 1024
+
+    for _ in range(args.ticks):
+        game.step()
+
+    print(game.dump_memory(args.top))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+import random
+
+from typing import List
+
+
+from core.game import Game
+from sprites import Bullet, Explosion, Mob, Pow
+
+from .harness import Case, benchmark
+
+COUNTS = (10, 100, 1000)
+
+
+def _make_mobs(game: Game, count: int) -> List[Mob]:
+    """Create mobs spread over the screen"""
+
+    mobs = [
+        Mob(game._window.width, game._window.height, game._load_mob_img())
+        for _ in range(count)
+    ]
+
+    for mob in mobs:
+        mob.rect.center = (
+            random.randrange(game._window.width),
+            random.randrange(game._window.height),
+        )
+
+    return mobs
+
+
+def _reset_groups(game: Game) -> None:
+    """Remove everything except the player from the game"""
+
+    for group in (
+        game._sprites,
+        game._mobs,
+        game._bullets,
+        game._powerups,
+        game._explosion_sprites,
+    ):
+        group.empty()
+
+    game._add_sprite(game._player)
+    game._health = 100
+
+
+@benchmark("mob_update", COUNTS)
+def mob_update(game: Game, count: int) -> Case:
+    mobs = _make_mobs(game, count)
+
+    def run() -> None:
+        for mob in mobs:
+            mob.update()
+
+    return Case(run, ops=count)
+
+
+@benchmark("mob_rotate", COUNTS)
+def mob_rotate(game: Game, count: int) -> Case:
+    mobs = _make_mobs(game, count)
+
+    def setup() -> None:
+        for mob in mobs:
+            mob.last_update = -1000
+
+    def run() -> None:
+        for mob in mobs:
+            mob.rotate()
+
+    return Case(run, setup, ops=count)
+
+
+@benchmark("explosion_animate", COUNTS)
+def explosion_animate(game: Game, count: int) -> Case:
+    explosions = [
+        Explosion(
+            (500, 400), random.choice(["lg", "sm", "player"]), game._explosion_images
+        )
+        for _ in range(count)
+    ]
+
+    def setup() -> None:
+        for explosion in explosions:
+            explosion._frame = 0
+            explosion._last_frame = -1000
+
+    def run() -> None:
+        for explosion in explosions:
+            explosion._animate()
+
+    return Case(run, setup, ops=count)
+
+
+@benchmark("bullet_update", COUNTS)
+def bullet_update(game: Game, count: int) -> Case:
+    bullets = [
+        Bullet(
+            random.randrange(game._window.width),
+            game._window.height,
+            game._get_bullet_img(),
+        )
+        for _ in range(count)
+    ]
+
+    def setup() -> None:
+        for bullet in bullets:
+            bullet.rect.bottom = game._window.height
+
+    def run() -> None:
+        for bullet in bullets:
+            bullet.update()
+
+    return Case(run, setup, ops=count)
+
+
+@benchmark("draw_text", (100,))
+def draw_text(game: Game, count: int) -> Case:
+    def run() -> None:
+        for i in range(count):
+            game._draw_text(game._renderer, "Очки: {}".format(i), 18, 500, 10)
+
+    return Case(run, ops=count)
+
+
+@benchmark("draw_sprites", COUNTS)
+def draw_sprites(game: Game, count: int) -> Case:
+    _reset_groups(game)
+
+    for mob in _make_mobs(game, count):
+        game._add_sprite(mob)
+
+    return Case(game._draw_sprites)
+
+
+@benchmark("load_mob_img", (10,))
+def load_mob_img(game: Game, count: int) -> Case:
+    def run() -> None:
+        for _ in range(count):
+            game._load_mob_img()
+
+    return Case(run, ops=count)
+
+
+@benchmark("check_bullet_collide_mobs", COUNTS)
+def check_bullet_collide_mobs(game: Game, count: int) -> Case:
+    mobs = _make_mobs(game, count)
+    bullets = [
+        Bullet(
+            random.randrange(game._window.width),
+            random.randrange(game._window.height),
+            game._get_bullet_img(),
+        )
+        for _ in range(count)
+    ]
+
+    def setup() -> None:
+        _reset_groups(game)
+
+        for mob in mobs:
+            game._add_sprite(mob)
+            game._add_mob_sprite(mob)
+
+        for bullet in bullets:
+            game._add_sprite(bullet)
+            game._add_bullet(bullet)
+
+    return Case(lambda: game._check_bullet_collide_mobs(game._collidable_mobs()), setup)
+
+
+@benchmark("check_player_collide_mobs", COUNTS)
+def check_player_collide_mobs(game: Game, count: int) -> Case:
+    mobs = _make_mobs(game, count)
+
+    def setup() -> None:
+        _reset_groups(game)
+
+        for mob in mobs:
+            game._add_sprite(mob)
+            game._add_mob_sprite(mob)
+
+    return Case(lambda: game._check_player_collide_mobs(game._collidable_mobs()), setup)
+
+
+@benchmark("check_player_collide_powerups", COUNTS)
+def check_player_collide_powerups(game: Game, count: int) -> Case:
+    pow_images = game._get_power_images()
+    powerups = []
+
+    for _ in range(count):
+        pow_type = random.choice(["gun", "shield"])
+        powerups.append(
+            Pow(
+                random.randrange(game._window.width),
+                random.randrange(game._window.height),
+                pow_images[pow_type],
+                game._window.height,
+                pow_type,
+            )
+        )
+
+    def setup() -> None:
+        _reset_groups(game)
+
+        for powerup in powerups:
+            game._add_sprite(powerup)
+            game._powerups.add(powerup)
+
+    return Case(game._check_player_collide_powerups, setup)
+
+
+@benchmark("render", (1,))
+def render(game: Game, count: int) -> Case:
+    return Case(game._render)
+
+
+@benchmark("reset", (1,))
+def reset(game: Game, count: int) -> Case:
+    return Case(game.reset)
@@ -0,0 +1,36 @@
+import random
+import sys
+import time
+
+from core.pacer import STRATEGIES, FramePacer
+
+FPS = 60
+FRAMES = 300
+
+
+def run(strategy: str, frames: int = FRAMES) -> FramePacer:
+    """Pace frames with simulated uneven work"""
+
+    random.seed(0)
+    pacer = FramePacer(FPS, strategy)
+
+    for _ in range(frames):
+        work_until = time.perf_counter() + random.uniform(0.002, 0.008)
+
+        while time.perf_counter() < work_until:
+            pass
+
+        pacer.wait()
+
+    return pacer
+
+
+def main() -> None:
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else FRAMES
+
+    for strategy in STRATEGIES:
+        print(run(strategy, frames).report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import random
+
+from core.game import Game
+
+from .harness import SEED, Case, benchmark
+
+TICKS = 300
+
+# the texture renderer always uses the SDL software driver here,
+# so the results are comparable on machines without GPU
+RENDERERS = ("surface", "texture-software")
+
+
+def _run_ticks(game: Game, before_step=None) -> Case:
+    """Run fixed amount of ticks"""
+
+    def setup() -> None:
+        random.seed(SEED)
+
+    def run() -> None:
+        for _ in range(TICKS):
+            if before_step:
+                before_step()
+
+            game.step()
+
+    return Case(run, setup, ops=TICKS)
+
+
+@benchmark("scenario_idle", kind="scenario", renderers=RENDERERS)
+def idle(game: Game, count: int) -> Case:
+    return _run_ticks(game)
+
+
+@benchmark("scenario_heavy_fire", kind="scenario", mobs_count=50)
+def heavy_fire(game: Game, count: int) -> Case:
+    def fire() -> None:
+        game._player.double_shoot()
+        game._player._last_shoot = -1000
+        game._shoot(random.choice(["left", "right"]))
+
+    return _run_ticks(game, fire)
+
+
+@benchmark("scenario_1k_mobs", kind="scenario", mobs_count=1000, renderers=RENDERERS)
+def mobs_1k(game: Game, count: int) -> Case:
+    return _run_ticks(game)
+
+
+@benchmark("scenario_explosion_storm", kind="scenario", renderers=RENDERERS)
+def explosion_storm(game: Game, count: int) -> Case:
+    def blow_up() -> None:
+        for _ in range(20):
+            game._blow_up(
+                random.choice(["lg", "sm", "player"]),
+                (
+                    random.randrange(game._window.width),
+                    random.randrange(game._window.height),
+                ),
+            )
+
+    return _run_ticks(game, blow_up)
@@ -0,0 +1,108 @@
+import random
+import time
+
+from typing import List
+
+from core import stream
+
+ENTITY_COUNTS = (10, 1_000, 10_000)
+TICKS = 300
+FPS = 60
+
+
+def _spawn(kind_weights: List[int]) -> list:
+    """Spawn random entity state"""
+
+    kind = random.choices(range(len(kind_weights)), kind_weights)[0]
+
+    return [
+        kind,
+        random.randrange(1000),
+        random.randrange(-100, 800),
+        random.randrange(-3, 3),
+        random.randrange(1, 10),
+        random.randrange(-8, 8),
+        0,
+    ]
+
+
+def _step(entities: dict, next_id: int, kind_weights: List[int]) -> int:
+    """Move entities, kill and spawn some of them"""
+
+    for state in entities.values():
+        state[1] += state[3]
+        state[2] += state[4]
+        state[6] = (state[6] + state[5]) % 360
+
+    churn = max(1, len(entities) // 100)
+
+    for key in random.sample(list(entities), churn):
+        del entities[key]
+
+    for _ in range(churn):
+        entities[next_id] = _spawn(kind_weights)
+        next_id += 1
+
+    return next_id
+
+
+def run(entities_count: int, compress_level: int) -> dict:
+    """Measure encoding cost and bandwidth"""
+
+    random.seed(entities_count)
+
+    # mobs, bullets and explosions dominate the scene
+    kind_weights = [0, 60, 25, 1, 1, 8, 4, 1]
+    entities = {key: _spawn(kind_weights) for key in range(entities_count)}
+    next_id = entities_count
+
+    encoder = stream.StateEncoder(keyframe_interval=FPS, compress_level=compress_level)
+    decoder = stream.StateDecoder()
+
+    encode_time = 0.0
+    total_bytes = 0
+
+    for tick in range(TICKS):
+        next_id = _step(entities, next_id, kind_weights)
+
+        snapshot = {
+            key: (kind, x, y, rot)
+            for key, (kind, x, y, _, _, _, rot) in entities.items()
+        }
+
+        started = time.perf_counter()
+        frame = encoder.encode(tick, snapshot, tick, 100, 3)
+        encode_time += time.perf_counter() - started
+
+        total_bytes += len(frame) + 4
+        decoder.decode(frame)
+
+    assert decoder.entities == snapshot
+
+    return {
+        "entities": entities_count,
+        "compress_level": compress_level,
+        "encode_us_per_tick": encode_time / TICKS * 1e6,
+        "bytes_per_tick": total_bytes / TICKS,
+        "kib_per_sec": total_bytes / TICKS * FPS / 1024,
+    }
+
+
+def main() -> None:
+    print(
+        "{:>8} {:>5} {:>14} {:>14} {:>12}".format(
+            "entities", "zlib", "encode us/tick", "bytes/tick", "KiB/s@60"
+        )
+    )
+
+    for entities_count in ENTITY_COUNTS:
+        for compress_level in (0, 1):
+            result = run(entities_count, compress_level)
+            print(
+                "{entities:>8} {compress_level:>5} {encode_us_per_tick:>14.1f} "
+                "{bytes_per_tick:>14.0f} {kib_per_sec:>12.1f}".format(**result)
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+import time
+
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import pygame
+
+COLORKEY = "colorkey"
+ALPHA = "alpha"
+
+Offset = Tuple[int, int]
+
+
+@dataclass
+class AssetReport:
+    """Optimization result of the asset"""
+
+    name: str
+    size_before: Tuple[int, int]
+    size_after: Tuple[int, int]
+    mode: str
+    blit_us_before: float
+    blit_us_after: float
+
+
+def blit_time(surface: pygame.Surface, blits: int = 50, repeat: int = 15) -> float:
+    """Measure blit time of the surface in microseconds
+
+    Mean time of blits is measured repeat times and the minimum is
+    returned, the slower runs are noise of the machine.
+    """
+
+    target = pygame.Surface((surface.get_width() + 2, surface.get_height() + 2))
+    target = target.convert()
+
+    # the first blit builds rle encoding, do not count it
+    target.blit(surface, (1, 1))
+
+    samples = []
+
+    for _ in range(repeat):
+        started = time.perf_counter()
+
+        for _ in range(blits):
+            target.blit(surface, (1, 1))
+
+        samples.append((time.perf_counter() - started) / blits * 1e6)
+
+    return min(samples)
+
+
+def crop_borders(surface: pygame.Surface) -> Tuple[pygame.Surface, Offset]:
+    """Crop transparent borders
+
+    Return cropped surface and offset of its center from the center of the
+    original one, so it can be placed at the same spot.
+    """
+
+    bounds = surface.get_bounding_rect()
+    full = surface.get_rect()
+
+    if bounds == full or not bounds.width or not bounds.height:
+        return surface, (0, 0)
+
+    cropped = surface.subsurface(bounds).copy()
+    offset = (bounds.centerx - full.centerx, bounds.centery - full.centery)
+
+    return cropped, offset
+
+
+class AssetOptimizer:
+    """Prepare loaded images for the fastest blit
+
+    Every image is converted to the display pixel format and gets rle
+    accelerated colorkey. With measure, it gets either colorkey or per
+    pixel alpha, whichever blits faster, the choice is measured once per
+    asset name and reused for its other sizes. Measuring takes blits on
+    every start and depends on timings, so it is off by default. Borders
+    can be cropped, then the offset of the cropped image center is
+    returned along with it.
+    """
+
+    def __init__(
+        self, colorkey: Tuple[int, int, int] = (0, 0, 0), measure: bool = False
+    ) -> None:
+        self._colorkey = colorkey
+        self._measure = measure
+        self._modes: Dict[str, str] = {}
+
+        self.reports: List[AssetReport] = []
+
+    def _to_colorkey(self, surface: pygame.Surface) -> pygame.Surface:
+        """Display format with rle colorkey"""
+
+        surface = surface.convert()
+        surface.set_colorkey(self._colorkey, pygame.RLEACCEL)
+
+        return surface
+
+    def _to_alpha(self, surface: pygame.Surface) -> pygame.Surface:
+        """Display format with per pixel alpha"""
+
+        surface = surface.convert()
+        surface.set_colorkey(self._colorkey)
+
+        return surface.convert_alpha()
+
+    def _choose_mode(self, name: str, surface: pygame.Surface) -> str:
+        """Measure which mode blits faster"""
+
+        mode = self._modes.get(name)
+
+        if mode is None:
+            if not self._measure:
+                mode = COLORKEY
+            elif blit_time(self._to_alpha(surface)) < blit_time(
+                self._to_colorkey(surface)
+            ):
+                mode = ALPHA
+            else:
+                mode = COLORKEY
+
+            self._modes[name] = mode
+
+        return mode
+
+    def optimize(
+        self, name: str, surface: pygame.Surface, crop: bool = False
+    ) -> Tuple[pygame.Surface, Offset]:
+        """Optimize the image, return it with the crop offset"""
+
+        original = surface.convert()
+        original.set_colorkey(self._colorkey)
+
+        offset: Offset = (0, 0)
+
+        if crop:
+            surface, offset = crop_borders(original)
+        else:
+            surface = original
+
+        is_new = name not in self._modes
+        mode = self._choose_mode(name, surface)
+
+        if mode == ALPHA:
+            optimized = self._to_alpha(surface)
+        else:
+            optimized = self._to_colorkey(surface)
+
+        if self._measure and is_new:
+            self.reports.append(
+                AssetReport(
+                    name,
+                    original.get_size(),
+                    optimized.get_size(),
+                    mode,
+                    blit_time(original),
+                    blit_time(optimized),
+                )
+            )
+
+        return optimized, offset
+
+    def report(self) -> str:
+        """Get per asset blit time report"""
+
+        lines = [
+            "{:<28} {:>9} {:>9} {:>8} {:>10} {:>10}".format(
+                "asset", "before", "after", "mode", "before us", "after us"
+            )
+        ]
+        total_before = 0.0
+        total_after = 0.0
+
+        for report in self.reports:
+            total_before += report.blit_us_before
+            total_after += report.blit_us_after
+
+            lines.append(
+                "{:<28} {:>9} {:>9} {:>8} {:>10.2f} {:>10.2f}".format(
+                    report.name[:28],
+                    "{}x{}".format(*report.size_before),
+                    "{}x{}".format(*report.size_after),
+                    report.mode,
+                    report.blit_us_before,
+                    report.blit_us_after,
+                )
+            )
+
+        lines.append(
+            "{:<28} {:>9} {:>9} {:>8} {:>10.2f} {:>10.2f}".format(
+                "total", "", "", "", total_before, total_after
+            )
+        )
+
+        return "\n".join(lines)
+
+
+def is_display_format(surface: pygame.Surface) -> bool:
+    """Does surface match the display pixel format"""
+
+    display = pygame.display.get_surface()
+
+    if display is None:
+        return True
+
+    if surface.get_flags() & pygame.SRCALPHA:
+        return surface.get_bitsize() == 32
+
+    return (
+        surface.get_bitsize() == display.get_bitsize()
+        and surface.get_masks()[:3] == display.get_masks()[:3]
+    )
+
+
+def ensure_display_format(surface: pygame.Surface) -> pygame.Surface:
+    """Convert surface to the display pixel format if needed"""
+
+    if is_display_format(surface):
+        return surface
+
+    if surface.get_flags() & pygame.SRCALPHA:
+        return surface.convert_alpha()
+
+    return surface.convert()
@@ -0,0 +1,280 @@
+from dataclasses import dataclass, field
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import pygame
+
+from . import memory
+
+
+@dataclass
+class _Shelf:
+    """Row of entries of the page"""
+
+    y: int
+    height: int
+    x: int = 0
+
+
+@dataclass
+class _Page:
+    """Atlas surface packed with shelves"""
+
+    surface: pygame.Surface
+    is_alpha: bool
+    colorkey: Optional[Tuple[int, ...]]
+    shelves: List[_Shelf] = field(default_factory=list)
+    used_area: int = 0
+    entries: int = 0
+
+    @property
+    def width(self) -> int:
+        return self.surface.get_width()
+
+    @property
+    def height(self) -> int:
+        return self.surface.get_height()
+
+    @property
+    def shelves_bottom(self) -> int:
+        if not self.shelves:
+            return 0
+
+        last = self.shelves[-1]
+        return last.y + last.height
+
+    def insert(self, width: int, height: int) -> Optional[pygame.Rect]:
+        """Find place for the entry using best height fit shelf"""
+
+        best: Optional[_Shelf] = None
+
+        for shelf in self.shelves:
+            if shelf.height >= height and self.width - shelf.x >= width:
+                if best is None or shelf.height < best.height:
+                    best = shelf
+
+        if best is None:
+            if self.height - self.shelves_bottom < height or self.width < width:
+                return None
+
+            best = _Shelf(self.shelves_bottom, height)
+            self.shelves.append(best)
+
+        rect = pygame.Rect(best.x, best.y, width, height)
+        best.x += width
+
+        return rect
+
+
+class TextureAtlas:
+    """Pack small images to a few large surfaces
+
+    Every added image is copied to a page with the same pixel format and
+    transparency mode and a subsurface view of it is returned, so sprites
+    can use it as a regular image. Entries can be added at any time, new
+    pages are created when the current ones are full. Pages are kept
+    small, so a mode with a few entries does not take much memory.
+
+    Regions are tracked in the category of their entry by their area and
+    pages only by the space not taken by the regions.
+    """
+
+    def __init__(
+        self,
+        page_size: Tuple[int, int] = (512, 512),
+        padding: int = 1,
+        accountant: Optional[memory.MemoryAccountant] = None,
+    ) -> None:
+        self._page_size = page_size
+        self._padding = padding
+        self._accountant = accountant
+
+        self._pages: List[_Page] = []
+        self._entries: Dict[Hashable, pygame.Surface] = {}
+        self._standalone = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[pygame.Surface]:
+        """Get atlas region of the entry"""
+
+        return self._entries.get(key)
+
+    def _new_page(
+        self,
+        is_alpha: bool,
+        colorkey: Optional[Tuple[int, ...]],
+        min_size: Tuple[int, int],
+    ) -> _Page:
+        """Create page fitting at least min_size"""
+
+        size = (
+            max(self._page_size[0], min_size[0]),
+            max(self._page_size[1], min_size[1]),
+        )
+
+        if is_alpha:
+            surface = pygame.Surface(size, pygame.SRCALPHA).convert_alpha()
+            surface.fill((0, 0, 0, 0))
+        else:
+            surface = pygame.Surface(size).convert()
+            surface.fill(colorkey or (0, 0, 0))
+
+            if colorkey is not None:
+                surface.set_colorkey(colorkey)
+
+        if self._accountant:
+            self._accountant.track(
+                surface, memory.ATLAS, "atlas page {}".format(len(self._pages))
+            )
+
+        page = _Page(surface, is_alpha, colorkey)
+        self._pages.append(page)
+
+        return page
+
+    def _place(
+        self,
+        width: int,
+        height: int,
+        is_alpha: bool,
+        colorkey: Optional[Tuple[int, ...]],
+    ) -> Tuple[_Page, pygame.Rect]:
+        """Find page and place for the entry"""
+
+        for page in self._pages:
+            if page.is_alpha != is_alpha or page.colorkey != colorkey:
+                continue
+
+            rect = page.insert(width, height)
+
+            if rect:
+                return page, rect
+
+        page = self._new_page(is_alpha, colorkey, (width, height))
+
+        return page, page.insert(width, height)
+
+    def add(
+        self,
+        key: Hashable,
+        surface: pygame.Surface,
+        category: str = memory.ATLAS,
+        label: str = "",
+    ) -> pygame.Surface:
+        """Copy image to the atlas, return its region
+
+        Images larger than half of the page would leave most of their page
+        empty, they are kept as they are.
+        """
+
+        region = self._entries.get(key)
+
+        if region is not None:
+            return region
+
+        width, height = surface.get_size()
+
+        if (width + self._padding) * 2 > self._page_size[0] or (
+            height + self._padding
+        ) * 2 > self._page_size[1]:
+            region = surface
+            self._standalone += 1
+        else:
+            region = self._pack(surface)
+
+        self._entries[key] = region
+
+        if self._accountant:
+            self._accountant.track(region, category, label)
+
+        return region
+
+    def _pack(self, surface: pygame.Surface) -> pygame.Surface:
+        """Copy image to a page, return its region"""
+
+        is_alpha = bool(surface.get_flags() & pygame.SRCALPHA)
+        colorkey = None if is_alpha else surface.get_colorkey()
+
+        width, height = surface.get_size()
+        page, rect = self._place(
+            width + self._padding, height + self._padding, is_alpha, colorkey
+        )
+        rect.size = (width, height)
+
+        if is_alpha:
+            # copy pixels as is instead of blending them over the empty page
+            page.surface.blit(surface, rect, special_flags=pygame.BLEND_RGBA_MAX)
+        else:
+            page.surface.blit(surface, rect)
+
+        region = page.surface.subsurface(rect)
+
+        if colorkey is not None:
+            region.set_colorkey(colorkey, pygame.RLEACCEL)
+
+        page.used_area += width * height
+        page.entries += 1
+
+        if self._accountant:
+            # the page itself holds only the space not given to regions
+            self._accountant.set_bytes(
+                page.surface,
+                memory.surface_bytes(page.surface)
+                - page.used_area * page.surface.get_bytesize(),
+            )
+
+        return region
+
+    def stats(self) -> List[Dict[str, float]]:
+        """Get usage and fragmentation of every page"""
+
+        pages = []
+
+        for page in self._pages:
+            area = page.width * page.height
+            shelves_area = sum(page.width * shelf.height for shelf in page.shelves)
+
+            pages.append(
+                {
+                    "size": "{}x{}".format(page.width, page.height),
+                    "mode": "alpha" if page.is_alpha else "colorkey",
+                    "entries": page.entries,
+                    "used": page.used_area / area,
+                    "free": 1 - shelves_area / area,
+                    # space taken by shelves but not by the entries
+                    "fragmentation": (
+                        1 - page.used_area / shelves_area if shelves_area else 0.0
+                    ),
+                }
+            )
+
+        return pages
+
+    def report(self) -> str:
+        """Get human readable atlas report"""
+
+        lines = [
+            "Atlas: {} entries, {} pages, {} standalone".format(
+                len(self), len(self._pages), self._standalone
+            )
+        ]
+
+        for i, page in enumerate(self.stats()):
+            lines.append(
+                "  page {} {:>9} {:<8} {:>5} entries used {:>5.1%} "
+                "free {:>5.1%} fragmentation {:>5.1%}".format(
+                    i,
+                    page["size"],
+                    page["mode"],
+                    page["entries"],
+                    page["used"],
+                    page["free"],
+                    page["fragmentation"],
+                )
+            )
+
+        return "\n".join(lines)
@@ -1,14 +1,24 @@
+from typing import Optional
+
 import pygame
 
+from . import memory
+from .renderer import Renderer
+
 
 class Background:
     """Game bg"""
 
-    def __init__(self, path: str) -> None:
+    def __init__(
+        self, path: str, accountant: Optional[memory.MemoryAccountant] = None
+    ) -> None:
         self._image = pygame.image.load(path).convert()
         self._rect = self._image.get_rect()
 
-    def blit(self, screen: pygame.Surface) -> None:
+        if accountant:
+            accountant.track(self._image, memory.BACKGROUND, "bg")
+
+    def blit(self, renderer: Renderer) -> None:
         """Blit screen"""
 
-        screen.blit(self._image, self._rect)
+        renderer.blit(self._image, self._rect)
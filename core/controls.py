@@ -0,0 +1,156 @@
+import time
+
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Tuple
+
+import pygame
+
+# the game window may be not the last one, so its closing is not a QUIT
+ALLOWED_EVENTS = [pygame.QUIT, pygame.WINDOWCLOSE, pygame.KEYDOWN, pygame.KEYUP]
+
+TRACKED_KEYS = (
+    pygame.K_LEFT,
+    pygame.K_RIGHT,
+    pygame.K_z,
+    pygame.K_x,
+    pygame.K_F9,
+)
+
+
+@dataclass(frozen=True)
+class InputState:
+    """Input state sampled once per tick"""
+
+    tick: int
+    held: FrozenSet[int] = frozenset()
+    pressed: FrozenSet[int] = frozenset()
+    buffered: FrozenSet[int] = frozenset()
+    is_quit: bool = False
+
+    def is_held(self, key: int) -> bool:
+        """Is key held down"""
+
+        return key in self.held
+
+    def is_pressed(self, key: int) -> bool:
+        """Was key pressed this tick"""
+
+        return key in self.pressed
+
+    def is_triggered(self, key: int) -> bool:
+        """Is key held or its press is still buffered"""
+
+        return key in self.held or key in self.buffered
+
+
+@dataclass
+class LatencyStats:
+    """Input to photon latency stats"""
+
+    ticks: Dict[int, int] = field(default_factory=dict)
+    total_ms: float = 0.0
+    samples: int = 0
+
+    def add(self, ticks: int, ms: float) -> None:
+        """Add latency sample"""
+
+        self.ticks[ticks] = self.ticks.get(ticks, 0) + 1
+        self.total_ms += ms
+        self.samples += 1
+
+    def as_dict(self) -> Dict[str, object]:
+        """Get stats summary"""
+
+        return {
+            "samples": self.samples,
+            "mean_ms": self.total_ms / self.samples if self.samples else 0.0,
+            "ticks": dict(sorted(self.ticks.items())),
+        }
+
+
+class InputHandler:
+    """Sample keyboard once per tick
+
+    Key presses are buffered for buffer_ticks ticks until the game
+    acknowledges them, so quick taps between two samples or during
+    reload are not lost. Every acknowledged press is tracked from the
+    sample of the tick it was handled in, so waiting in the buffer is
+    not counted, until the next present after the one of its frame
+    returns, as only then the frame is surely on the screen.
+    """
+
+    def __init__(self, buffer_ticks: int = 15) -> None:
+        self._buffer_ticks = buffer_ticks
+
+        # key -> tick of the press
+        self._buffer: Dict[int, int] = {}
+        self._sampled_at = 0.0
+        # (tick, time) of the presses handled this tick and of the ones
+        # whose frame is presented but maybe not shown yet
+        self._acknowledged: List[Tuple[int, float]] = []
+        self._presenting: List[Tuple[int, float]] = []
+
+        self.latency = LatencyStats()
+        self.state = InputState(0)
+
+    def filter_events(self) -> None:
+        """Keep only events the game uses in the queue"""
+
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(ALLOWED_EVENTS)
+        pygame.event.clear()
+
+    def sample(self, tick: int, events: List[pygame.event.Event]) -> InputState:
+        """Sample input state for the tick"""
+
+        self._sampled_at = time.perf_counter()
+        pressed = set()
+        is_quit = False
+
+        for event in events:
+            if event.type in (pygame.QUIT, pygame.WINDOWCLOSE):
+                is_quit = True
+            elif event.type == pygame.KEYDOWN and event.key in TRACKED_KEYS:
+                pressed.add(event.key)
+                self._buffer[event.key] = tick
+
+        for key, pressed_tick in list(self._buffer.items()):
+            if tick - pressed_tick > self._buffer_ticks:
+                del self._buffer[key]
+
+        keys_pressed = pygame.key.get_pressed()
+
+        self.state = InputState(
+            tick,
+            frozenset(key for key in TRACKED_KEYS if keys_pressed[key]),
+            frozenset(pressed),
+            frozenset(self._buffer),
+            is_quit,
+        )
+
+        return self.state
+
+    def clear(self) -> None:
+        """Drop buffered and pending presses"""
+
+        self._buffer.clear()
+        self._acknowledged.clear()
+        self._presenting.clear()
+
+    def acknowledge(self, key: int) -> None:
+        """Mark buffered press of the key as handled"""
+
+        if self._buffer.pop(key, None) is not None:
+            self._acknowledged.append((self.state.tick, self._sampled_at))
+
+    def presented(self, tick: int) -> None:
+        """Frame of the tick is on the screen"""
+
+        if self._presenting:
+            now = time.perf_counter()
+
+            for handled_tick, handled_time in self._presenting:
+                self.latency.add(tick - handled_tick, (now - handled_time) * 1000)
+
+        self._presenting = self._acknowledged
+        self._acknowledged = []
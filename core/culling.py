@@ -0,0 +1,93 @@
+from typing import Dict, Iterable, List, Optional, TypeVar
+
+import pygame
+
+DRAW = "draw"
+COLLISION = "collision"
+
+# live bullet circles reach up to 23 px above the screen top and mob
+# circles up to 14 px out of their rects, so mobs farther than 37 px
+# could not be hit
+DEFAULT_MARGIN = 40
+
+SpriteT = TypeVar("SpriteT", bound=pygame.sprite.Sprite)
+
+
+class Culler:
+    """Skip work for sprites outside the screen
+
+    The viewport is the screen inflated by margin, sprites not touching it
+    are neither drawn nor collision tested. Margin has to be larger than
+    the collision shapes reach out of the rects, so the culled sprites
+    could not collide anyway. When disabled every sprite is visible.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        margin: int = DEFAULT_MARGIN,
+        enabled: bool = True,
+    ) -> None:
+        self.margin = margin
+        self.viewport: Optional[pygame.Rect] = (
+            pygame.Rect(0, 0, width, height).inflate(margin * 2, margin * 2)
+            if enabled
+            else None
+        )
+
+        self.frames = 0
+        self.last: Dict[str, int] = {DRAW: 0, COLLISION: 0}
+        self.totals: Dict[str, int] = {DRAW: 0, COLLISION: 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.viewport is not None
+
+    def is_visible(self, rect: pygame.Rect) -> bool:
+        """Does rect touch the viewport"""
+
+        return self.viewport is None or self.viewport.colliderect(rect)
+
+    def visible(self, sprites: Iterable[SpriteT], kind: str) -> List[SpriteT]:
+        """Get sprites touching the viewport, count the culled ones"""
+
+        if self.viewport is None:
+            return list(sprites)
+
+        colliderect = self.viewport.colliderect
+        visible = []
+        culled = 0
+
+        for sprite in sprites:
+            if colliderect(sprite.rect):
+                visible.append(sprite)
+            else:
+                culled += 1
+
+        self.last[kind] += culled
+        self.totals[kind] += culled
+
+        return visible
+
+    def begin_frame(self) -> None:
+        """Reset counts of the last frame"""
+
+        self.frames += 1
+
+        for kind in self.last:
+            self.last[kind] = 0
+
+    def as_dict(self) -> Dict[str, object]:
+        """Get culling stats"""
+
+        return {
+            "enabled": self.enabled,
+            "margin": self.margin,
+            "frames": self.frames,
+            "last": dict(self.last),
+            "mean": {
+                kind: total / self.frames if self.frames else 0.0
+                for kind, total in self.totals.items()
+            },
+        }
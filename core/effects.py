@@ -0,0 +1,106 @@
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Hashable, Optional, Set
+
+SPAWN = "spawn"
+EXPLOSION = "explosion"
+POWERUP = "powerup"
+SOUND = "sound"
+
+
+@dataclass
+class Command:
+    """Deferred spawn or effect"""
+
+    kind: str
+    action: Callable[[], None]
+    key: Optional[Hashable] = None
+
+
+class EffectQueue:
+    """Per frame queue of spawns and effects
+
+    Commands are run in order, at most budget of them per drain, the rest
+    is carried over to the next tick. Commands with the same key are
+    coalesced while one of them is still pending, e.g. several boom
+    sounds of one multi kill frame are played once.
+    """
+
+    def __init__(self, budget: Optional[int] = 8) -> None:
+        self.budget = budget
+
+        self._commands: Deque[Command] = deque()
+        self._pending_keys: Set[Hashable] = set()
+
+        self.pushed = 0
+        self.executed = 0
+        self.coalesced = 0
+        self.carried_over = 0
+        self.last_carried_over = 0
+        self.max_depth = 0
+
+    @property
+    def depth(self) -> int:
+        """Pending commands count"""
+
+        return len(self._commands)
+
+    def push(
+        self, kind: str, action: Callable[[], None], key: Optional[Hashable] = None
+    ) -> bool:
+        """Queue command, return False if it was coalesced"""
+
+        if key is not None:
+            if key in self._pending_keys:
+                self.coalesced += 1
+                return False
+
+            self._pending_keys.add(key)
+
+        self._commands.append(Command(kind, action, key))
+        self.pushed += 1
+
+        if len(self._commands) > self.max_depth:
+            self.max_depth = len(self._commands)
+
+        return True
+
+    def drain(self) -> int:
+        """Run queued commands within the budget, return how many were run"""
+
+        executed = 0
+
+        while self._commands and (self.budget is None or executed < self.budget):
+            command = self._commands.popleft()
+
+            if command.key is not None:
+                self._pending_keys.discard(command.key)
+
+            command.action()
+            executed += 1
+
+        self.executed += executed
+        self.last_carried_over = len(self._commands)
+        self.carried_over += self.last_carried_over
+
+        return executed
+
+    def clear(self) -> None:
+        """Drop all queued commands"""
+
+        self._commands.clear()
+        self._pending_keys.clear()
+
+    def stats(self) -> Dict[str, object]:
+        """Get queue stats"""
+
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "pushed": self.pushed,
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "carried_over": self.carried_over,
+            "last_carried_over": self.last_carried_over,
+            "budget": self.budget,
+        }
@@ -1,16 +1,25 @@
 import os
 import random
 
+from functools import partial
+
 import pygame
 
 from random import randrange
-from time import sleep
 from typing import Optional, List, Dict, Tuple
 
 from sprites import Bullet, Explosion, Mob, Player, Pow
 
 from .window import Window
 from .background import Background
+from . import effects, memory, stream
+from .renderer import Renderer, create_renderer
+from .assets import AssetOptimizer, Offset, ensure_display_format
+from .atlas import TextureAtlas
+from .pacer import FramePacer
+from .controls import InputHandler
+from .profiler import FrameProfiler
+from .culling import COLLISION, DEFAULT_MARGIN, DRAW, Culler
 
 
 class Game:
@@ -23,6 +32,10 @@ class Game:
     RED = (255, 0, 0)
     YELLOW = (255, 255, 0)
 
+    # random mob sizes are rounded to the middles of buckets of this size,
+    # to keep few images with the same mean size
+    MOB_SIZE_STEP = 5
+
     def __init__(
         self,
         width: int,
@@ -32,35 +45,77 @@ class Game:
         mobs_count: int = 10,
         is_god_mode: bool = False,
         lives: int = 3,
+        stream_path: Optional[str] = None,
+        pacing: str = "hybrid",
+        pacing_report_path: Optional[str] = None,
+        memory_budget: Optional[int] = None,
+        memory_report_path: Optional[str] = None,
+        restart_on_game_over: bool = False,
+        game_over_delay: int = 2000,
+        restart_delay: int = 500,
+        effects_budget: Optional[int] = 8,
+        renderer: str = "surface",
+        profile_dir: str = "profiles",
+        profile_frames: int = 0,
+        culling: bool = True,
+        culling_margin: int = DEFAULT_MARGIN,
+        measure_assets: bool = False,
     ) -> None:
 
         self._assets_path = self._get_assets_path()
         self._mobs_count = mobs_count
         self._is_god_mode = is_god_mode
+        self._tick = 0
+
+        self._lives = lives
+        self._restart_on_game_over = restart_on_game_over
+        self._game_over_delay = game_over_delay
+        self._restart_delay = restart_delay
+
+        self._is_game_running = False
+        self._is_game_over = False
+        self._game_over_time = 0
+        self._death_expl: Optional[Explosion] = None
+        self._effects = effects.EffectQueue(effects_budget)
+        self._score = 0
+        self._health = 100
 
         self._create_sprite_groups()
 
-        self._clock = pygame.time.Clock()
+        self._pacer = FramePacer(fps, pacing)
+        self._pacing_report_path = pacing_report_path
+
+        self._initialize_profiler(profile_dir, profile_frames)
+
+        self._initialize_memory(memory_budget)
+        self._memory_report_path = memory_report_path
+
+        self._assets = AssetOptimizer(self.BLACK, measure_assets)
+        self._atlas = TextureAtlas(accountant=self._memory)
+        self._offsets: Dict[Tuple[str, Tuple[int, int]], Offset] = {}
 
         self._initialize_pygame()
-        self._initialize_window(width, height, caption)
+        self._initialize_window(width, height, caption, renderer)
+        self._culler = Culler(width, height, culling_margin, culling)
+        self._initialize_input()
 
         self._load_images()
 
-        self._player = Player(
-            self._window.width, self._window.height, self._get_player_img(), lives
-        )
-
-        self._add_sprite(self._player)
+        self._add_player()
         self._add_mobs()
 
         self._fps = fps
 
         self._bg = self._load_bg()
         self._font_name = pygame.font.match_font("arial")
+        self._fonts: Dict[int, pygame.font.Font] = {}
 
         self._load_sounds()
 
+        self._state_publisher: Optional[stream.StatePublisher] = (
+            stream.StatePublisher(stream_path) if stream_path else None
+        )
+
     def _initialize_pygame(self) -> None:
         """Initialize pygame"""
 
@@ -68,16 +123,43 @@ class Game:
         pygame.mixer.init()
 
     def _initialize_window(
-        self, window_w: int, window_h: int, window_caption: str
+        self, window_w: int, window_h: int, window_caption: str, renderer: str
     ) -> None:
         """Initialize window"""
 
         self._window = Window(window_w, window_h, window_caption)
 
-        self._screen: pygame.Surface = self._window.get_screen()
+        self._renderer: Renderer = create_renderer(renderer, self._window)
 
         self._window.set_caption()
 
+    def _initialize_memory(self, budget: Optional[int]) -> None:
+        """Initialize surface memory accounting"""
+
+        self._memory = memory.MemoryAccountant(budget)
+
+        self._text_cache = memory.SurfaceCache(
+            "hud_text", memory.HUD_TEXT, self._memory, max_entries=64
+        )
+        self._rotation_cache = memory.SurfaceCache(
+            "rotation", memory.ROTATION, self._memory, max_bytes=2 * 1024 * 1024
+        )
+
+    def _initialize_profiler(self, output_dir: str, frames: int) -> None:
+        """Initialize on demand frame profiler"""
+
+        self._profiler = FrameProfiler(output_dir)
+        self._profiler.install_signal_handler()
+
+        if frames:
+            self._profiler.request(frames)
+
+    def _initialize_input(self) -> None:
+        """Initialize input"""
+
+        self._input = InputHandler()
+        self._input.filter_events()
+
     def _create_sprite_groups(self):
         """Create sprite groups"""
 
@@ -85,6 +167,7 @@ class Game:
         self._mobs = pygame.sprite.Group()
         self._bullets = pygame.sprite.Group()
         self._powerups = pygame.sprite.Group()
+        self._explosion_sprites = pygame.sprite.Group()
 
     def _load_images(self):
         """Preload all images"""
@@ -150,25 +233,45 @@ class Game:
 
         bg_path = os.path.join(self._assets_path, "bg/bg.jpg")
 
-        return Background(bg_path)
+        return Background(bg_path, self._memory)
 
-    def _load_img(self, path: str, *size: Optional[int]) -> pygame.Surface:
+    def _load_img(
+        self, path: str, *size: Optional[int], category: str = memory.SPRITE
+    ) -> pygame.Surface:
         """Helper method for loading images"""
 
-        img = pygame.image.load(path).convert()
-        img.set_colorkey(self.BLACK)
+        img = pygame.image.load(path)
 
         if any(size):
-            return pygame.transform.scale(img, size)
+            img = pygame.transform.scale(img, size)
+
+        img, _ = self._optimize_img(os.path.basename(path), img, category)
 
         return img
 
-    def _load_sprite_img(self, filename: str, *size: Optional[int]):
+    def _optimize_img(
+        self, name: str, img: pygame.Surface, category: str, crop: bool = False
+    ) -> Tuple[pygame.Surface, Offset]:
+        """Optimize image for blitting and pack it to the atlas"""
+
+        key = (name, img.get_size())
+        region = self._atlas.get(key)
+
+        if region is None:
+            img, offset = self._assets.optimize(name, img, crop)
+            region = self._atlas.add(key, img, category, name)
+            self._offsets[key] = offset
+
+        return region, self._offsets[key]
+
+    def _load_sprite_img(
+        self, filename: str, *size: Optional[int], category: str = memory.SPRITE
+    ):
         """Load sprite image"""
 
         img_path = os.path.join(self._assets_path, "sprites/{}".format(filename))
 
-        return self._load_img(img_path, *size)
+        return self._load_img(img_path, *size, category=category)
 
     def _load_player_img(self) -> pygame.Surface:
         """Load player img"""
@@ -200,6 +303,20 @@ class Game:
         sm: List[pygame.Surface] = []
         player: List[pygame.Surface] = []
 
+        self._explosion_offsets: Dict[str, List[Offset]] = {
+            "lg": [],
+            "sm": [],
+            "player": [],
+        }
+
+        def add(size: str, frames: List[pygame.Surface], name: str, img) -> None:
+            # explosions are not collided, so their borders can be cropped
+            img, offset = self._optimize_img(
+                "{}@{}".format(name, size), img, memory.EXPLOSION, crop=True
+            )
+            frames.append(img)
+            self._explosion_offsets[size].append(offset)
+
         for explosion_i in range(8 + 1):
             filename = "regularExplosion0{}.png".format(explosion_i)
             player_filename = "sonicExplosion0{}.png".format(explosion_i)
@@ -211,19 +328,14 @@ class Game:
                 self._assets_path, "explosions/{}".format(player_filename)
             )
 
-            img = self._load_img(explosion_img_path)
-            img.set_colorkey(self.BLACK)
+            img = pygame.image.load(explosion_img_path)
 
-            img_lg = pygame.transform.scale(img, (75, 75))
-            lg.append(img_lg)
+            add("lg", lg, filename, pygame.transform.scale(img, (75, 75)))
+            add("sm", sm, filename, pygame.transform.scale(img, (32, 32)))
 
-            img_sm = pygame.transform.scale(img, (32, 32))
-            sm.append(img_sm)
+            player_explosion_img = pygame.image.load(player_explosion_img_path)
 
-            player_explosion_img = self._load_img(player_explosion_img_path)
-            player_explosion_img.set_colorkey(self.BLACK)
-
-            player.append(player_explosion_img)
+            add("player", player, player_filename, player_explosion_img)
 
         return {
             "lg": lg,
@@ -254,6 +366,14 @@ class Game:
             "shield": self._preload_images.get("pow_shield"),
         }
 
+    def _bucket_mob_size(self, size: int, start: int, stop: int) -> int:
+        """Round size from range(start, stop) to the middle of its bucket"""
+
+        step = self.MOB_SIZE_STEP
+        last_middle = start + ((stop - start) // step - 1) * step + step // 2
+
+        return min(start + (size - start) // step * step + step // 2, last_middle)
+
     def _load_mob_img(self) -> pygame.Surface:
         """Load mob img"""
 
@@ -262,10 +382,29 @@ class Game:
             self._assets_path, "sprites/mob{}.png".format(random_mob)
         )
 
-        random_width = randrange(45, 70)
-        random_height = randrange(32, 58)
+        random_width = self._bucket_mob_size(randrange(45, 70), 45, 70)
+        random_height = self._bucket_mob_size(randrange(32, 58), 32, 58)
 
-        return self._load_img(mob_img_path, random_width, random_height)
+        # every mob size bucket is loaded once and then reused from the atlas
+        region = self._atlas.get(
+            (os.path.basename(mob_img_path), (random_width, random_height))
+        )
+
+        if region is not None:
+            return region
+
+        return self._load_img(
+            mob_img_path, random_width, random_height, category=memory.MOB
+        )
+
+    def _add_player(self) -> None:
+        """Add new player to the game"""
+
+        self._player = Player(
+            self._window.width, self._window.height, self._get_player_img(), self._lives
+        )
+
+        self._add_sprite(self._player)
 
     def _add_sprite(self, sprite: pygame.sprite.Sprite) -> None:
         """Add sprite to the game"""
@@ -278,7 +417,14 @@ class Game:
     def _add_mob(self) -> None:
         """Add mob to the mobs"""
 
-        m = Mob(self._window.width, self._window.height, self._load_mob_img())
+        m = Mob(
+            self._window.width,
+            self._window.height,
+            self._load_mob_img(),
+            self._rotation_cache,
+            rotate_image=not self._renderer.rotates_sprites,
+            viewport=self._culler.viewport,
+        )
 
         self._add_sprite(m)
         self._add_mob_sprite(m)
@@ -294,8 +440,10 @@ class Game:
 
         self._bullets.add(bullet)
 
-    def _add_powerup(self, center: Tuple[int, int]):
-        pow_type = random.choice(["gun", "shield"])
+    def _add_powerup(self, center: Tuple[int, int], pow_type: Optional[str] = None):
+        if pow_type is None:
+            pow_type = random.choice(["gun", "shield"])
+
         random_pow_img = self._get_power_images().get(pow_type)
         powerup = Pow(*center, random_pow_img, self._window.height, pow_type)
 
@@ -318,8 +466,38 @@ class Game:
         self._play_background_music()
         self._main_loop()
 
-    def _shoot(self, direction: str) -> None:
-        """Shoot!"""
+    def reset(self) -> None:
+        """Start a new round
+
+        Only the simulation is reset, window, fonts, sounds and loaded
+        or cached images are kept.
+        """
+
+        for group in (
+            self._sprites,
+            self._mobs,
+            self._bullets,
+            self._powerups,
+            self._explosion_sprites,
+        ):
+            group.empty()
+
+        self._add_player()
+        self._add_mobs()
+
+        self._score = 0
+        self._health = 100
+        self._death_expl = None
+        self._is_game_over = False
+
+        self._effects.clear()
+        self._input.clear()
+
+        if self._is_game_running:
+            self._play_background_music()
+
+    def _shoot(self, direction: str) -> bool:
+        """Shoot! Return True if player was reloaded"""
 
         x = self._player.rect.left if direction == "left" else self._player.rect.right
 
@@ -347,20 +525,32 @@ class Game:
 
             self._shoot_sound.play()
 
+            return True
+
+        return False
+
     def _dispatch_events(self, events: List[pygame.event.Event]):
         """Dispatch game events"""
 
-        for event in events:
-            if event.type == pygame.QUIT:
-                self._stop()
-                break
+        input_state = self._input.sample(self._tick, events)
+
+        if input_state.is_quit:
+            self._stop()
+            return
 
-            key_states = pygame.key.get_pressed()
+        self._player.set_input(input_state)
 
-            if key_states[pygame.K_z]:
-                self._shoot("left")
-            if key_states[pygame.K_x]:
-                self._shoot("right")
+        for key in (pygame.K_LEFT, pygame.K_RIGHT):
+            if input_state.is_triggered(key):
+                self._input.acknowledge(key)
+
+        if input_state.is_triggered(pygame.K_z) and self._shoot("left"):
+            self._input.acknowledge(pygame.K_z)
+        if input_state.is_triggered(pygame.K_x) and self._shoot("right"):
+            self._input.acknowledge(pygame.K_x)
+
+        if input_state.is_pressed(pygame.K_F9):
+            self._profiler.request()
 
     def _update_sprites(self) -> None:
         """Update game sprites"""
@@ -370,37 +560,32 @@ class Game:
     def _draw_sprites(self) -> None:
         """Render all sprites"""
 
-        self._sprites.draw(self._screen)
+        self._renderer.draw_sprites(self._culler.visible(self._sprites, DRAW))
 
     def _fill_screen(self, color: Tuple[int, int, int]) -> None:
         """Fill the screen with color"""
 
-        self._screen.fill(color)
+        self._renderer.fill(color)
 
     def _flip_screen(self) -> None:
         """Flip the screen"""
 
-        pygame.display.flip()
-
-    def _update_screen(self) -> None:
-        """Update the screen"""
-
-        pygame.display.update()
+        self._renderer.present()
 
     def _blit_bg(self) -> None:
         """Blit the bg"""
 
-        self._bg.blit(self._screen)
+        self._bg.blit(self._renderer)
 
     def _draw_info(self) -> None:
         """Draw game info"""
 
         self._draw_text(
-            self._screen, f"Очки: {self._score}", 18, self._window.width / 2, 10
+            self._renderer, f"Очки: {self._score}", 18, self._window.width / 2, 10
         )
-        self._draw_health_bar(self._screen, 5, 5, self._health)
+        self._draw_health_bar(self._renderer, 5, 5, self._health)
         self._draw_lives(
-            self._screen,
+            self._renderer,
             self._window.width - ((30 * self._player.lives) + 10),
             5,
             self._player.lives,
@@ -419,9 +604,8 @@ class Game:
         """Render game over screen"""
 
         self._fill_screen(self.BLACK)
-        self._update_screen()
         self._draw_text(
-            self._screen,
+            self._renderer,
             "GAME OVER",
             35,
             self._window.width / 2,
@@ -429,15 +613,79 @@ class Game:
             self.RED,
         )
         self._draw_text(
-            self._screen,
+            self._renderer,
             f"SCORE: {self._score}",
             18,
             self._window.width / 2,
             (self._window.height / 2) + 50,
             self.RED,
         )
+        self._draw_text(
+            self._renderer,
+            "Z - играть снова",
+            18,
+            self._window.width / 2,
+            (self._window.height / 2) + 80,
+            self.WHITE,
+        )
         self._flip_screen()
 
+    def get_pacing_stats(self) -> Dict[str, float]:
+        """Get frame pacing stats"""
+
+        return self._pacer.stats.as_dict()
+
+    def get_assets_report(self) -> str:
+        """Get per asset blit time report"""
+
+        return self._assets.report()
+
+    def get_atlas_report(self) -> str:
+        """Get texture atlas usage and fragmentation report"""
+
+        return self._atlas.report()
+
+    def get_culling_stats(self) -> Dict[str, object]:
+        """Get counts of the culled sprites"""
+
+        return self._culler.as_dict()
+
+    def get_effects_stats(self) -> Dict[str, object]:
+        """Get deferred spawns and effects queue stats"""
+
+        return self._effects.stats()
+
+    def get_memory_stats(self) -> Dict[str, object]:
+        """Get surface memory stats"""
+
+        return self._memory.stats()
+
+    def dump_memory(self, top: int = 10) -> str:
+        """Get report of the largest surface memory holders"""
+
+        return self._memory.report(top)
+
+    def get_entity_counts(self) -> Dict[str, int]:
+        """Get counts of the live entities"""
+
+        return {
+            "sprites": len(self._sprites),
+            "mobs": len(self._mobs),
+            "bullets": len(self._bullets),
+            "powerups": len(self._powerups),
+            "explosions": len(self._explosion_sprites),
+        }
+
+    def profile(self, frames: Optional[int] = None) -> None:
+        """Capture profile of the next frames"""
+
+        self._profiler.request(frames)
+
+    def get_input_latency_stats(self) -> Dict[str, object]:
+        """Get input to photon latency stats"""
+
+        return self._input.latency.as_dict()
+
     def _update(self) -> None:
         """Update the game"""
 
@@ -446,28 +694,120 @@ class Game:
     def _quit_game(self) -> None:
         """Quit the game"""
 
+        if self._state_publisher:
+            self._state_publisher.close()
+
+        self._profiler.stop()
+        self._renderer.close()
+
+        if self._pacing_report_path:
+            self._pacer.dump(self._pacing_report_path)
+
+        if self._memory_report_path:
+            self._memory.dump(self._memory_report_path)
+
         pygame.quit()
 
+    def _collect_state(self) -> stream.Snapshot:
+        """Collect entities state for the spectators"""
+
+        entity_id = self._state_publisher.entity_id
+        snapshot: stream.Snapshot = {}
+
+        def add(sprite: pygame.sprite.Sprite, kind: int, extra: int = 0) -> None:
+            x, y = sprite.rect.center
+            snapshot[entity_id(sprite)] = (kind, x, y, extra)
+
+        if self._player.alive():
+            add(self._player, stream.KIND_PLAYER)
+
+        for mob in self._mobs:
+            add(mob, stream.KIND_MOB, mob.rot)
+
+        for bullet in self._bullets:
+            add(bullet, stream.KIND_BULLET)
+
+        for powerup in self._powerups:
+            add(
+                powerup,
+                (
+                    stream.KIND_POW_GUN
+                    if powerup.type == "gun"
+                    else stream.KIND_POW_SHIELD
+                ),
+            )
+
+        explosion_kinds = {
+            "lg": stream.KIND_EXPLOSION_LG,
+            "sm": stream.KIND_EXPLOSION_SM,
+            "player": stream.KIND_EXPLOSION_PLAYER,
+        }
+
+        for explosion in self._explosion_sprites:
+            add(explosion, explosion_kinds[explosion.size], explosion.frame)
+
+        return snapshot
+
+    def _publish_state(self) -> None:
+        """Publish game state to the spectators"""
+
+        if not self._state_publisher or not self._state_publisher.is_connected:
+            return
+
+        self._state_publisher.publish(
+            self._tick,
+            self._collect_state(),
+            self._score,
+            self._health,
+            self._player.lives,
+        )
+
     def _blow_up(self, size: str, center: Tuple[int, int]):
         """Spawn new explosion"""
 
-        expl = Explosion(center, size, self._explosion_images)
+        expl = Explosion(center, size, self._explosion_images, self._explosion_offsets)
         self._add_sprite(expl)
+        self._explosion_sprites.add(expl)
 
         return expl
 
-    def _check_player_collide_mobs(self) -> None:
+    def _play_sound(self, sound: pygame.mixer.Sound, key: str) -> None:
+        """Queue sound, sounds with the same key are played once per drain"""
+
+        self._effects.push(effects.SOUND, sound.play, ("sound", key))
+
+    def _collidable_mobs(self) -> List[Mob]:
+        """Get mobs to collision test this tick"""
+
+        return self._culler.visible(self._mobs, COLLISION)
+
+    def _check_player_collide_mobs(self, mobs: List[Mob]) -> None:
         """Game over if player collide with mobs"""
 
+        # hidden player is far below the screen
+        if self._culler.enabled and self._player.is_hidden():
+            return
+
         hits: List[pygame.sprite.Sprite] = pygame.sprite.spritecollide(
-            self._player, self._mobs, True, pygame.sprite.collide_rect_ratio(0.52)
+            self._player,
+            mobs,
+            False,
+            pygame.sprite.collide_rect_ratio(0.52),
         )
 
         for hit in hits:
             hit: Mob
+
+            # shot this tick after the mobs were collected
+            if not hit.alive():
+                continue
+
+            hit.kill()
             self._health -= hit.radius * 2
-            self._blow_up("sm", hit.rect.center)
-            self._add_mob()
+            self._effects.push(
+                effects.EXPLOSION, partial(self._blow_up, "sm", hit.rect.center)
+            )
+            self._effects.push(effects.SPAWN, self._add_mob)
 
             if self._health < 0:
                 self._death_expl = self._blow_up("player", self._player.rect.center)
@@ -491,6 +831,9 @@ class Game:
     def _check_player_collide_powerups(self) -> None:
         """Power up player if player collide with powerups"""
 
+        if self._culler.enabled and self._player.is_hidden():
+            return
+
         hits: List[pygame.sprite.Sprite] = pygame.sprite.spritecollide(
             self._player, self._powerups, True, pygame.sprite.collide_rect_ratio(0.52)
         )
@@ -503,29 +846,40 @@ class Game:
             if hit.type == "gun":
                 self._powerup_gun()
 
-            self._powerup_sound.play()
+            self._play_sound(self._powerup_sound, "powerup")
 
-    def _check_bullet_collide_mobs(self) -> None:
+    def _check_bullet_collide_mobs(self, mobs: List[Mob]) -> None:
         """Kill mobs if bullet colide they"""
 
         hits = pygame.sprite.groupcollide(
-            self._mobs, self._bullets, True, True, pygame.sprite.collide_circle
+            mobs,
+            self._bullets,
+            False,
+            True,
+            pygame.sprite.collide_circle,
         )
 
         for hit in hits:
             hit: Mob
+            hit.kill()
             self._score += 36 - hit.radius
 
-            self._boom_sound.play()
-            self._blow_up("lg", hit.rect.center)
+            self._play_sound(self._boom_sound, "boom")
+            self._effects.push(
+                effects.EXPLOSION, partial(self._blow_up, "lg", hit.rect.center)
+            )
 
             if random.random() > 0.9:
-                self._add_powerup(hit.rect.center)
-            self._add_mob()
+                pow_type = random.choice(["gun", "shield"])
+                self._effects.push(
+                    effects.POWERUP,
+                    partial(self._add_powerup, hit.rect.center, pow_type),
+                )
+            self._effects.push(effects.SPAWN, self._add_mob)
 
     def _draw_text(
         self,
-        surface: pygame.Surface,
+        renderer: Renderer,
         text: str,
         size: int,
         x: float,
@@ -534,16 +888,24 @@ class Game:
     ):
         """Draw text on the screen"""
 
-        font = pygame.font.Font(self._font_name, size)
-        text_surface = font.render(text, True, color)
+        key = (text, size, color)
+        text_surface = self._text_cache.get(key)
+
+        if text_surface is None:
+            font = self._fonts.get(size)
+
+            if font is None:
+                font = self._fonts[size] = pygame.font.Font(self._font_name, size)
+
+            text_surface = ensure_display_format(font.render(text, True, color))
+            self._text_cache.put(key, text_surface, text)
+
         text_rect = text_surface.get_rect()
 
         text_rect.midtop = (x, y)
-        surface.blit(text_surface, text_rect)
+        renderer.blit(text_surface, text_rect)
 
-    def _draw_health_bar(
-        self, surface: pygame.Surface, x: int, y: int, health: int = 0
-    ):
+    def _draw_health_bar(self, renderer: Renderer, x: int, y: int, health: int = 0):
         """Draw health bar"""
 
         if health < 0:
@@ -555,50 +917,106 @@ class Game:
         outline_rect = pygame.Rect(x, y, health_bar_length, heath_bar_height)
         fill_rect = pygame.Rect(x, y, health, heath_bar_height)
 
-        pygame.draw.rect(surface, self.WHITE, outline_rect)
-        pygame.draw.rect(surface, self.GREEN, fill_rect)
-        self._draw_text(surface, f"{health}%", 18, x + (health_bar_length + 30), 0)
+        renderer.draw_rect(self.WHITE, outline_rect)
+        renderer.draw_rect(self.GREEN, fill_rect)
+        self._draw_text(renderer, f"{health}%", 18, x + (health_bar_length + 30), 0)
 
-    def _draw_lives(self, surface: pygame.Surface, x: int, y: int, lives: int):
+    def _draw_lives(self, renderer: Renderer, x: int, y: int, lives: int):
         for i in range(lives):
             img_rect = self._get_heart_img().get_rect()
             img_rect.x = x + 30 * i
             img_rect.y = y
 
-            surface.blit(self._get_heart_img(), img_rect)
+            renderer.blit(self._get_heart_img(), img_rect)
 
     def _game_over(self):
         """Game over"""
 
+        self._is_game_over = True
+        self._game_over_time = pygame.time.get_ticks()
+
+        self._stop_background_music()
         self._render_game_over()
         self._game_over_sound.play()
 
-    def _main_loop(self) -> None:
-        """The main game loop"""
-
-        while self._is_game_running:
-            events: List[pygame.event.Event] = pygame.event.get()
+    def _step_game_over(self) -> None:
+        """Wait on the game over screen for restart or quit"""
 
-            self._dispatch_events(events)
-            self._update()
+        events: List[pygame.event.Event] = pygame.event.get()
+        input_state = self._input.sample(self._tick, events)
 
-            self._check_player_collide_powerups()
-            self._check_bullet_collide_mobs()
+        self._tick += 1
 
-            if not self._is_god_mode:
-                self._check_player_collide_mobs()
+        if input_state.is_quit:
+            self._stop()
+            return
 
-            self._render()
+        shown = pygame.time.get_ticks() - self._game_over_time
 
-            self._clock.tick(self._fps)
+        # fire keys restart, so taps of the last fight must not skip the screen
+        if shown > self._restart_delay and (
+            input_state.is_pressed(pygame.K_z) or input_state.is_pressed(pygame.K_x)
+        ):
+            self.reset()
+            return
 
-            if (
-                hasattr(self, "_death_expl")
-                and self._player.lives <= 0
-                and not self._death_expl.alive()
-            ):
+        if shown > self._game_over_delay:
+            if self._restart_on_game_over:
+                self.reset()
+            else:
                 self._stop()
 
-        self._game_over()
-        sleep(2)
+    def step(self) -> None:
+        """Advance the game by one tick without waiting for the next frame"""
+
+        self._profiler.begin_frame(self._tick, self.get_entity_counts())
+
+        if self._is_game_over:
+            self._step_game_over()
+        else:
+            self._step_game()
+
+        self._profiler.end_frame()
+
+    def _step_game(self) -> None:
+        """Advance the running game by one tick"""
+
+        self._culler.begin_frame()
+
+        events: List[pygame.event.Event] = pygame.event.get()
+
+        self._dispatch_events(events)
+        self._update()
+
+        self._check_player_collide_powerups()
+
+        # filter once, so culled mobs are counted once per tick
+        mobs = self._collidable_mobs()
+        self._check_bullet_collide_mobs(mobs)
+
+        if not self._is_god_mode:
+            self._check_player_collide_mobs(mobs)
+
+        self._effects.drain()
+
+        self._render()
+        self._input.presented(self._tick)
+        self._publish_state()
+
+        self._tick += 1
+
+        if (
+            self._death_expl is not None
+            and self._player.lives <= 0
+            and not self._death_expl.alive()
+        ):
+            self._game_over()
+
+    def _main_loop(self) -> None:
+        """The main game loop"""
+
+        while self._is_game_running:
+            self.step()
+            self._pacer.wait()
+
         self._quit_game()
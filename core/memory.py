@@ -0,0 +1,399 @@
+import sys
+import weakref
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import count
+from typing import Dict, Hashable, Iterator, List, Optional, Tuple
+
+import pygame
+
+SPRITE = "sprite"
+MOB = "mob"
+ROTATION = "rotation"
+EXPLOSION = "explosion"
+HUD_TEXT = "hud_text"
+BACKGROUND = "background"
+ATLAS = "atlas"
+
+
+def surface_bytes(surface: pygame.Surface) -> int:
+    """Get pixel memory held by the surface
+
+    Subsurfaces share pixels with the parent, they are counted by their
+    own area, so the parent has to be tracked without it.
+    """
+
+    if surface.get_parent() is not None:
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+    return surface.get_pitch() * surface.get_height()
+
+
+def _is_held_elsewhere(surface: pygame.Surface) -> bool:
+    """Is the cached surface referenced by anything but its cache item
+
+    References are the cache item, this argument and the getrefcount one.
+    """
+
+    return sys.getrefcount(surface) > 3
+
+
+@dataclass
+class _Entry:
+    """Tracked surface"""
+
+    ref: "weakref.ref[pygame.Surface]"
+    category: str
+    label: str
+    size: Tuple[int, int]
+    bytes: int
+
+
+@dataclass
+class _CacheItem:
+    """Cached surface"""
+
+    surface: pygame.Surface
+    bytes: int
+    used: int
+
+
+class SurfaceCache:
+    """LRU cache of surfaces which can be rebuilt at any time
+
+    Size can be limited by entries and by bytes. Caches of one accountant
+    share the use clock, so it can evict the least recently used surface
+    of all of them.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        category: str,
+        accountant: Optional["MemoryAccountant"] = None,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ) -> None:
+        self.name = name
+        self.category = category
+        self._accountant = accountant
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._surfaces: "OrderedDict[Hashable, _CacheItem]" = OrderedDict()
+        self._bytes = 0
+        self._clock: Iterator[int] = accountant.clock if accountant else count()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if accountant:
+            accountant.register_cache(self)
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+    def get(self, key: Hashable) -> Optional[pygame.Surface]:
+        """Get cached surface"""
+
+        item = self._surfaces.get(key)
+
+        if item is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        item.used = next(self._clock)
+        self._surfaces.move_to_end(key)
+
+        return item.surface
+
+    def put(self, key: Hashable, surface: pygame.Surface, label: str = "") -> None:
+        """Cache surface"""
+
+        old = self._surfaces.pop(key, None)
+
+        if old is not None:
+            self._bytes -= old.bytes
+
+        item = _CacheItem(surface, surface_bytes(surface), next(self._clock))
+        self._surfaces[key] = item
+        self._bytes += item.bytes
+
+        while len(self._surfaces) > 1 and (
+            (self._max_entries is not None and len(self._surfaces) > self._max_entries)
+            or (self._max_bytes is not None and self._bytes > self._max_bytes)
+        ):
+            self.evict_oldest()
+
+        if self._accountant:
+            self._accountant.track(surface, self.category, label or self.name)
+            self._accountant.enforce_budget()
+
+    def evict_oldest(self) -> bool:
+        """Drop least recently used surface, return False if cache is empty"""
+
+        if not self._surfaces:
+            return False
+
+        _, item = self._surfaces.popitem(last=False)
+        self._bytes -= item.bytes
+        self.evictions += 1
+
+        return True
+
+    def clear(self) -> None:
+        """Drop all surfaces"""
+
+        self.evictions += len(self._surfaces)
+        self._surfaces.clear()
+        self._bytes = 0
+
+    def _unused(self) -> Iterator[Tuple[Hashable, _CacheItem]]:
+        """Iterate surfaces held by the cache only, least recently used first"""
+
+        for key, item in self._surfaces.items():
+            if not _is_held_elsewhere(item.surface):
+                yield key, item
+
+    def oldest_unused(self) -> Optional[Tuple[Hashable, int]]:
+        """Get key and use clock of the least recently used unused surface"""
+
+        for key, item in self._unused():
+            return key, item.used
+
+        return None
+
+    def evict(self, key: Hashable) -> None:
+        """Drop cached surface"""
+
+        item = self._surfaces.pop(key)
+        self._bytes -= item.bytes
+        self.evictions += 1
+
+    @property
+    def unused_bytes(self) -> int:
+        """Pixel memory freed by evicting the surfaces held by the cache only"""
+
+        return sum(item.bytes for _, item in self._unused())
+
+    @property
+    def bytes(self) -> int:
+        """Pixel memory held by the cache"""
+
+        return self._bytes
+
+
+class MemoryAccountant:
+    """Track surfaces pixel memory by category
+
+    Surfaces are tracked weakly and counted while they are alive. When
+    live memory exceeds the budget, the least recently used surfaces of
+    all registered caches are evicted until it fits. Only surfaces held
+    by the caches alone are evicted, since the others would stay alive.
+    When evicting them could not fit the budget, caches are kept as they
+    are and the miss is counted.
+    """
+
+    def __init__(self, budget: Optional[int] = None) -> None:
+        self.budget = budget
+        self.live_bytes = 0
+        self.peak_bytes = 0
+        self.budget_evictions = 0
+        self.budget_misses = 0
+        self.clock = count()
+
+        self._entries: Dict[int, _Entry] = {}
+        self._caches: List[SurfaceCache] = []
+
+    def register_cache(self, cache: SurfaceCache) -> None:
+        """Register cache which can be evicted to fit the budget"""
+
+        self._caches.append(cache)
+
+    def track(
+        self, surface: pygame.Surface, category: str, label: str = ""
+    ) -> pygame.Surface:
+        """Start tracking the surface, return it back"""
+
+        key = id(surface)
+
+        if key in self._entries:
+            return surface
+
+        size = surface_bytes(surface)
+
+        self._entries[key] = _Entry(
+            weakref.ref(surface, lambda _: self._forget(key)),
+            category,
+            label,
+            surface.get_size(),
+            size,
+        )
+
+        self.live_bytes += size
+
+        if self.live_bytes > self.peak_bytes:
+            self.peak_bytes = self.live_bytes
+
+        return surface
+
+    def set_bytes(self, surface: pygame.Surface, size: int) -> None:
+        """Change memory counted for the tracked surface"""
+
+        entry = self._entries.get(id(surface))
+
+        if entry is None:
+            return
+
+        self.live_bytes += size - entry.bytes
+        entry.bytes = size
+
+        if self.live_bytes > self.peak_bytes:
+            self.peak_bytes = self.live_bytes
+
+    def _forget(self, key: int) -> None:
+        """Surface was freed"""
+
+        entry = self._entries.pop(key, None)
+
+        if entry:
+            self.live_bytes -= entry.bytes
+
+    def is_over_budget(self) -> bool:
+        """Is live memory over the budget"""
+
+        return self.budget is not None and self.live_bytes > self.budget
+
+    def enforce_budget(self) -> None:
+        """Evict caches until live memory fits the budget"""
+
+        if not self.is_over_budget():
+            return
+
+        # surfaces still used elsewhere, e.g. the current image of a mob,
+        # would stay alive after eviction
+        unused = sum(cache.unused_bytes for cache in self._caches)
+
+        if self.live_bytes - unused > self.budget:
+            self.budget_misses += 1
+            return
+
+        while self.is_over_budget():
+            oldest: Optional[Tuple[SurfaceCache, Hashable, int]] = None
+
+            for cache in self._caches:
+                found = cache.oldest_unused()
+
+                if found and (oldest is None or found[1] < oldest[2]):
+                    oldest = (cache, *found)
+
+            if oldest is None:
+                self.budget_misses += 1
+                return
+
+            oldest[0].evict(oldest[1])
+            self.budget_evictions += 1
+
+    def by_category(self) -> Dict[str, Tuple[int, int]]:
+        """Get (surfaces, bytes) for every category"""
+
+        totals: Dict[str, Tuple[int, int]] = {}
+
+        for entry in self._entries.values():
+            count, size = totals.get(entry.category, (0, 0))
+            totals[entry.category] = (count + 1, size + entry.bytes)
+
+        return totals
+
+    def stats(self) -> Dict[str, object]:
+        """Get memory stats summary"""
+
+        return {
+            "live_bytes": self.live_bytes,
+            "peak_bytes": self.peak_bytes,
+            "budget": self.budget,
+            "budget_evictions": self.budget_evictions,
+            "budget_misses": self.budget_misses,
+            "categories": {
+                category: {"surfaces": count, "bytes": size}
+                for category, (count, size) in self.by_category().items()
+            },
+            "caches": {
+                cache.name: {
+                    "entries": len(cache),
+                    "bytes": cache.bytes,
+                    "hits": cache.hits,
+                    "misses": cache.misses,
+                    "evictions": cache.evictions,
+                }
+                for cache in self._caches
+            },
+        }
+
+    def report(self, top: int = 10) -> str:
+        """Get human readable report with the largest holders"""
+
+        kib = 1 / 1024
+
+        lines = [
+            "Surface memory: live {:.1f} KiB, peak {:.1f} KiB, budget {}".format(
+                self.live_bytes * kib,
+                self.peak_bytes * kib,
+                (
+                    "{:.1f} KiB, evictions {}, unfit {}".format(
+                        self.budget * kib, self.budget_evictions, self.budget_misses
+                    )
+                    if self.budget
+                    else "none"
+                ),
+            ),
+            "By category:",
+        ]
+
+        for category, (count, size) in sorted(
+            self.by_category().items(), key=lambda item: -item[1][1]
+        ):
+            lines.append(
+                "  {:<12} {:>6} surfaces {:>10.1f} KiB".format(
+                    category, count, size * kib
+                )
+            )
+
+        lines.append("Caches:")
+
+        for cache in self._caches:
+            lines.append(
+                "  {:<12} {:>6} entries  {:>10.1f} KiB hits {} misses {} evictions {}".format(
+                    cache.name,
+                    len(cache),
+                    cache.bytes * kib,
+                    cache.hits,
+                    cache.misses,
+                    cache.evictions,
+                )
+            )
+
+        lines.append("Largest surfaces:")
+
+        for entry in sorted(self._entries.values(), key=lambda entry: -entry.bytes)[
+            :top
+        ]:
+            lines.append(
+                "  {:<12} {:<24} {:>4}x{:<4} {:>10.1f} KiB".format(
+                    entry.category,
+                    entry.label[:24],
+                    entry.size[0],
+                    entry.size[1],
+                    entry.bytes * kib,
+                )
+            )
+
+        return "\n".join(lines)
+
+    def dump(self, path: str, top: int = 50) -> None:
+        """Write memory report to the file"""
+
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.report(top) + "\n")
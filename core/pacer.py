@@ -0,0 +1,203 @@
+import time
+
+from typing import Dict, List, Optional
+
+STRATEGY_SLEEP = "sleep"
+STRATEGY_BUSY = "busy"
+STRATEGY_HYBRID = "hybrid"
+
+STRATEGIES = (STRATEGY_SLEEP, STRATEGY_BUSY, STRATEGY_HYBRID)
+
+# jitter histogram bucket upper bounds in microseconds
+JITTER_BUCKETS = (50, 100, 250, 500, 1000, 2000, 4000, 8000, 16000)
+
+
+class FrameStats:
+    """Frame pacing statistics"""
+
+    def __init__(self) -> None:
+        self.histogram: List[int] = [0] * (len(JITTER_BUCKETS) + 1)
+        self.frames = 0
+        self.missed_deadlines = 0
+        self.jitter_total_us = 0.0
+        self.jitter_max_us = 0.0
+        self.spin_time = 0.0
+        self.sleep_time = 0.0
+        self.elapsed = 0.0
+
+    def add_frame(self, jitter_us: float) -> None:
+        """Add frame interval deviation to the stats"""
+
+        self.frames += 1
+        self.jitter_total_us += jitter_us
+
+        if jitter_us > self.jitter_max_us:
+            self.jitter_max_us = jitter_us
+
+        for i, bound in enumerate(JITTER_BUCKETS):
+            if jitter_us <= bound:
+                self.histogram[i] += 1
+                return
+
+        self.histogram[-1] += 1
+
+    def percentile(self, percent: float) -> float:
+        """Get jitter percentile upper bound in microseconds
+
+        Bucket bound is clamped to the max jitter, which may be below it.
+        """
+
+        if not self.frames:
+            return 0.0
+
+        threshold = self.frames * percent / 100
+        seen = 0
+
+        for i, frames in enumerate(self.histogram):
+            seen += frames
+
+            if seen >= threshold:
+                if i < len(JITTER_BUCKETS):
+                    return min(JITTER_BUCKETS[i], self.jitter_max_us)
+
+                return self.jitter_max_us
+
+        return self.jitter_max_us
+
+    def as_dict(self) -> Dict[str, float]:
+        """Get stats summary"""
+
+        frames = self.frames or 1
+
+        return {
+            "frames": self.frames,
+            "missed_deadlines": self.missed_deadlines,
+            "jitter_mean_us": self.jitter_total_us / frames,
+            "jitter_p50_us": self.percentile(50),
+            "jitter_p99_us": self.percentile(99),
+            "jitter_max_us": self.jitter_max_us,
+            "spin_time_s": self.spin_time,
+            "sleep_time_s": self.sleep_time,
+            "spin_share": self.spin_time / self.elapsed if self.elapsed else 0.0,
+        }
+
+
+class FramePacer:
+    """Wait for the exact frame deadline
+
+    Deadlines are absolute, so the time spent by the frame itself does not
+    shift the next one. The wait strategy is one of:
+
+    - sleep: sleep until the deadline, cheapest but coarse
+    - busy: spin until the deadline like Clock.tick_busy_loop
+    - hybrid: sleep until spin_margin before the deadline, then spin
+    """
+
+    def __init__(
+        self, fps: int, strategy: str = STRATEGY_HYBRID, spin_margin: float = 0.002
+    ) -> None:
+        if strategy not in STRATEGIES:
+            raise ValueError(
+                "Unknown pacing strategy {!r}, expected one of {}".format(
+                    strategy, ", ".join(STRATEGIES)
+                )
+            )
+
+        self.strategy = strategy
+        self._period = 1 / fps
+        self._spin_margin = spin_margin
+
+        self.stats = FrameStats()
+
+        self._started: Optional[float] = None
+        self._deadline: Optional[float] = None
+        self._last_frame: Optional[float] = None
+
+    def _sleep(self, until: float) -> None:
+        """Sleep until the time"""
+
+        started = time.perf_counter()
+        remaining = until - started
+
+        if remaining > 0:
+            time.sleep(remaining)
+            # count oversleeping as well, it is what makes sleep jittery
+            self.stats.sleep_time += time.perf_counter() - started
+
+    def _spin(self, until: float) -> None:
+        """Spin until the time"""
+
+        started = time.perf_counter()
+        now = started
+
+        while now < until:
+            now = time.perf_counter()
+
+        self.stats.spin_time += now - started
+
+    def wait(self) -> float:
+        """Wait for the next frame deadline, return frame time in seconds"""
+
+        now = time.perf_counter()
+
+        if self._deadline is None:
+            self._started = now
+            self._deadline = now + self._period
+            self._last_frame = now
+
+            return 0.0
+
+        if now > self._deadline:
+            self.stats.missed_deadlines += 1
+
+            # do not try to catch up with frames that were lost
+            if now - self._deadline > self._period:
+                self._deadline = now
+        else:
+            if self.strategy == STRATEGY_SLEEP:
+                self._sleep(self._deadline)
+            elif self.strategy == STRATEGY_BUSY:
+                self._spin(self._deadline)
+            else:
+                self._sleep(self._deadline - self._spin_margin)
+                self._spin(self._deadline)
+
+        now = time.perf_counter()
+        frame_time = now - self._last_frame
+
+        self.stats.add_frame(abs(frame_time - self._period) * 1e6)
+        self.stats.elapsed = now - self._started
+
+        self._last_frame = now
+        self._deadline += self._period
+
+        return frame_time
+
+    def report(self) -> str:
+        """Get human readable pacing report"""
+
+        lines = ["Frame pacing ({}):".format(self.strategy)]
+
+        for key, value in self.stats.as_dict().items():
+            lines.append(
+                "  {:<18} {}".format(
+                    key, "{:.3f}".format(value) if isinstance(value, float) else value
+                )
+            )
+
+        lines.append("  jitter histogram:")
+        lower = 0
+
+        for bound, frames in zip(
+            JITTER_BUCKETS + (float("inf"),), self.stats.histogram
+        ):
+            lines.append("    {:>6} - {:<6} us {}".format(lower, bound, frames))
+            lower = bound
+
+        return "\n".join(lines)
+
+    def dump(self, path: str) -> None:
+        """Write pacing report to the file"""
+
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.report() + "\n")
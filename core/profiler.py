@@ -0,0 +1,259 @@
+import json
+import marshal
+import os
+import signal
+import sys
+import threading
+import time
+
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+# (filename, first line, function name), the same as pstats uses
+CodeKey = Tuple[str, int, str]
+Stack = Tuple[CodeKey, ...]
+
+
+def _code_key(frame) -> CodeKey:
+    code = frame.f_code
+    return (code.co_filename, code.co_firstlineno, code.co_name)
+
+
+def _code_label(key: CodeKey) -> str:
+    filename, _, name = key
+    module = os.path.splitext(os.path.basename(filename))[0]
+    return "{}:{}".format(module, name)
+
+
+class FrameProfiler:
+    """Statistical profiler capturing the next frames of the game loop
+
+    While capturing, the main thread stack is sampled every interval
+    seconds of cpu time by SIGPROF timer, or by a background thread where
+    the timer is not available. Samples are tagged with the frame they
+    were taken in and the entity counts of that frame, and when the
+    capture is over they are written as pstats file, collapsed stacks for
+    flamegraph and json with the frames metadata.
+    """
+
+    def __init__(
+        self,
+        output_dir: str = "profiles",
+        interval: float = 0.001,
+        default_frames: int = 120,
+    ) -> None:
+        self._output_dir = output_dir
+        self._interval = interval
+        self._default_frames = default_frames
+
+        self._main_thread_id = threading.main_thread().ident
+        self._requested_frames = 0
+
+        self._is_capturing = False
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+        self._frame_tag = ""
+        self._remaining_frames = 0
+        self._samples: "Counter[Tuple[str, Stack]]" = Counter()
+        self._frames: List[Dict[str, object]] = []
+        self._started = 0.0
+
+        self.last_capture: Optional[str] = None
+
+    @property
+    def is_capturing(self) -> bool:
+        """Is capture running"""
+
+        return self._is_capturing
+
+    def request(self, frames: Optional[int] = None) -> None:
+        """Capture the next frames, safe to call from signal handler"""
+
+        self._requested_frames = frames or self._default_frames
+
+    def install_signal_handler(self, signum: Optional[int] = None) -> bool:
+        """Start capture on the signal, SIGUSR1 by default"""
+
+        if signum is None:
+            signum = getattr(signal, "SIGUSR1", None)
+
+        if signum is None or not self._is_main_thread():
+            return False
+
+        signal.signal(signum, lambda *_: self.request())
+
+        return True
+
+    def begin_frame(self, frame: int, entities: Dict[str, int]) -> None:
+        """Frame is started, start requested capture"""
+
+        if self._requested_frames and not self._is_capturing:
+            self._start(self._requested_frames)
+            self._requested_frames = 0
+
+        if not self._is_capturing:
+            return
+
+        self._frame_tag = "frame_{}[{}]".format(
+            frame, ",".join("{}={}".format(k, v) for k, v in entities.items())
+        )
+        self._frames.append(
+            {"frame": frame, "time": time.perf_counter() - self._started, **entities}
+        )
+
+    def end_frame(self) -> None:
+        """Frame is finished, stop capture after the last one"""
+
+        if not self._is_capturing:
+            return
+
+        self._remaining_frames -= 1
+
+        if self._remaining_frames <= 0:
+            self.stop()
+
+    def _is_main_thread(self) -> bool:
+        return threading.get_ident() == self._main_thread_id
+
+    def _start(self, frames: int) -> None:
+        """Start sampling"""
+
+        self._remaining_frames = frames
+        self._samples = Counter()
+        self._frames = []
+        self._started = time.perf_counter()
+        self._is_capturing = True
+
+        # sampling thread only gets the GIL when the main thread releases
+        # it, so its samples are biased to display flip and alike, timer
+        # signal interrupts the main thread itself
+        if hasattr(signal, "setitimer") and self._is_main_thread():
+            signal.signal(signal.SIGPROF, self._on_timer)
+            signal.setitimer(signal.ITIMER_PROF, self._interval, self._interval)
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._sample_thread, name="frame-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def _add_sample(self, frame) -> None:
+        """Count stack of the frame"""
+
+        stack: List[CodeKey] = []
+
+        while frame is not None:
+            stack.append(_code_key(frame))
+            frame = frame.f_back
+
+        stack.reverse()
+        self._samples[(self._frame_tag, tuple(stack))] += 1
+
+    def _on_timer(self, signum: int, frame) -> None:
+        self._add_sample(frame)
+
+    def _sample_thread(self) -> None:
+        """Sample main thread stack until stopped"""
+
+        while not self._stop_event.wait(self._interval):
+            self._add_sample(sys._current_frames().get(self._main_thread_id))
+
+    def stop(self) -> Optional[str]:
+        """Stop capture and write it, return output files prefix"""
+
+        if not self._is_capturing:
+            return None
+
+        if self._thread is None:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, signal.SIG_DFL)
+        else:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+
+        self._is_capturing = False
+
+        os.makedirs(self._output_dir, exist_ok=True)
+        prefix = os.path.join(
+            self._output_dir,
+            "spacerush-{}-frame{}".format(
+                time.strftime("%Y%m%d-%H%M%S"),
+                self._frames[0]["frame"] if self._frames else 0,
+            ),
+        )
+
+        self._write_collapsed(prefix + ".collapsed")
+        self._write_pstats(prefix + ".prof")
+        self._write_frames(prefix + ".json")
+
+        self.last_capture = prefix
+
+        return prefix
+
+    def _write_collapsed(self, path: str) -> None:
+        """Write collapsed stacks rooted at the frame tag"""
+
+        with open(path, "w", encoding="utf-8") as f:
+            for (tag, stack), count in sorted(self._samples.items()):
+                labels = [tag] + [_code_label(key) for key in stack]
+                f.write("{} {}\n".format(";".join(labels), count))
+
+    def _write_pstats(self, path: str) -> None:
+        """Write samples as pstats file
+
+        Every sample counts interval seconds of own time for the leaf
+        function and of cumulative time for every function on the stack.
+        """
+
+        # key -> [primitive calls, calls, own time, cumulative time, callers]
+        stats: Dict[CodeKey, list] = {}
+
+        for (_, stack), count in self._samples.items():
+            seconds = count * self._interval
+            seen = set()
+
+            for i, key in enumerate(stack):
+                entry = stats.setdefault(key, [0, 0, 0.0, 0.0, {}])
+
+                if key not in seen:
+                    seen.add(key)
+                    entry[0] += count
+                    entry[1] += count
+                    entry[3] += seconds
+
+                if i == len(stack) - 1:
+                    entry[2] += seconds
+
+                if i:
+                    caller = stack[i - 1]
+                    callers = entry[4]
+                    cc, nc, tt, ct = callers.get(caller, (0, 0, 0.0, 0.0))
+                    callers[caller] = (
+                        cc + count,
+                        nc + count,
+                        tt + (seconds if i == len(stack) - 1 else 0.0),
+                        ct + seconds,
+                    )
+
+        with open(path, "wb") as f:
+            marshal.dump(
+                {key: tuple(entry) for key, entry in stats.items()},
+                f,
+            )
+
+    def _write_frames(self, path: str) -> None:
+        """Write captured frames metadata"""
+
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "interval": self._interval,
+                    "samples": sum(self._samples.values()),
+                    "frames": self._frames,
+                },
+                f,
+                indent=2,
+            )
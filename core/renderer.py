@@ -0,0 +1,169 @@
+import weakref
+
+from abc import ABC, abstractmethod
+from typing import Iterable, Tuple, Union
+
+import pygame
+
+from .window import Window
+
+SURFACE = "surface"
+TEXTURE = "texture"
+TEXTURE_SOFTWARE = "texture-software"
+
+RENDERERS = (SURFACE, TEXTURE, TEXTURE_SOFTWARE)
+
+Color = Tuple[int, int, int]
+Dest = Union[pygame.Rect, Tuple[float, float]]
+
+
+def _dest_rect(surface: pygame.Surface, dest: Dest) -> pygame.Rect:
+    """Get rect the surface is drawn to"""
+
+    if isinstance(dest, pygame.Rect):
+        return dest
+
+    return pygame.Rect(dest, surface.get_size())
+
+
+class Renderer(ABC):
+    """Drawing backend
+
+    rotates_sprites tells if sprites may leave rotation to the renderer,
+    then they keep the original image and set render_angle instead.
+    """
+
+    rotates_sprites = False
+
+    @abstractmethod
+    def fill(self, color: Color) -> None:
+        """Fill the screen with color"""
+
+    @abstractmethod
+    def blit(self, surface: pygame.Surface, dest: Dest, angle: float = 0) -> None:
+        """Draw image at the position, rotated by angle around its center"""
+
+    @abstractmethod
+    def draw_rect(self, color: Color, rect: pygame.Rect) -> None:
+        """Draw filled rect"""
+
+    def draw_sprites(self, sprites: Iterable[pygame.sprite.Sprite]) -> None:
+        """Draw sprites"""
+
+        for sprite in sprites:
+            self.blit(sprite.image, sprite.rect, getattr(sprite, "render_angle", 0))
+
+    @abstractmethod
+    def present(self) -> None:
+        """Show drawn frame"""
+
+    def close(self) -> None:
+        """Free backend resources"""
+
+
+class SurfaceRenderer(Renderer):
+    """Software blitting to the display surface"""
+
+    def __init__(self, screen: pygame.Surface) -> None:
+        self.screen = screen
+
+    def fill(self, color: Color) -> None:
+        self.screen.fill(color)
+
+    def blit(self, surface: pygame.Surface, dest: Dest, angle: float = 0) -> None:
+        if angle:
+            center = _dest_rect(surface, dest).center
+            surface = pygame.transform.rotate(surface, angle)
+            dest = surface.get_rect(center=center)
+
+        self.screen.blit(surface, dest)
+
+    def draw_rect(self, color: Color, rect: pygame.Rect) -> None:
+        pygame.draw.rect(self.screen, color, rect)
+
+    def draw_sprites(self, sprites: Iterable[pygame.sprite.Sprite]) -> None:
+        self.screen.blits(
+            [(sprite.image, sprite.rect) for sprite in sprites], doreturn=False
+        )
+
+    def present(self) -> None:
+        pygame.display.flip()
+
+
+class TextureRenderer(Renderer):
+    """SDL2 Renderer with the images uploaded to textures once
+
+    Sprites are rotated by the renderer. The display module window is
+    only kept hidden to give surfaces the pixel format to convert to,
+    the game is drawn to its own window.
+    """
+
+    rotates_sprites = True
+
+    def __init__(self, window: Window, software: bool = False) -> None:
+        from pygame._sdl2 import video
+
+        self._video = video
+
+        pygame.display.set_mode((1, 1), pygame.HIDDEN)
+
+        self._window = video.Window(window.caption, (window.width, window.height))
+        self._renderer = video.Renderer(self._window, accelerated=0 if software else -1)
+
+        self._textures: "weakref.WeakKeyDictionary[pygame.Surface, object]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self.uploads = 0
+
+    def _get_texture(self, surface: pygame.Surface):
+        """Get texture of the surface, upload it on the first use"""
+
+        texture = self._textures.get(surface)
+
+        if texture is None:
+            texture = self._video.Texture.from_surface(self._renderer, surface)
+            self._textures[surface] = texture
+            self.uploads += 1
+
+        return texture
+
+    def fill(self, color: Color) -> None:
+        self._renderer.draw_color = (*color, 255)
+        self._renderer.clear()
+
+    def blit(self, surface: pygame.Surface, dest: Dest, angle: float = 0) -> None:
+        dest_rect = _dest_rect(surface, dest)
+
+        if angle:
+            # SDL rotates clockwise, pygame.transform.rotate counterclockwise
+            rect = surface.get_rect(center=dest_rect.center)
+            self._get_texture(surface).draw(dstrect=rect, angle=-angle)
+        else:
+            rect = surface.get_rect(topleft=dest_rect.topleft)
+            self._get_texture(surface).draw(dstrect=rect)
+
+    def draw_rect(self, color: Color, rect: pygame.Rect) -> None:
+        self._renderer.draw_color = (*color, 255)
+        self._renderer.fill_rect(rect)
+
+    def present(self) -> None:
+        self._renderer.present()
+
+    def close(self) -> None:
+        self._textures.clear()
+        self._window.destroy()
+
+
+def create_renderer(kind: str, window: Window) -> Renderer:
+    """Create renderer for the window"""
+
+    if kind == SURFACE:
+        return SurfaceRenderer(window.get_screen())
+    if kind == TEXTURE:
+        return TextureRenderer(window)
+    if kind == TEXTURE_SOFTWARE:
+        return TextureRenderer(window, software=True)
+
+    raise ValueError(
+        "Unknown renderer {!r}, expected one of {}".format(kind, ", ".join(RENDERERS))
+    )
@@ -0,0 +1,367 @@
+import os
+import queue
+import socket
+import stat
+import struct
+import threading
+import weakref
+import zlib
+
+from itertools import count
+from typing import Dict, Iterator, Optional, Tuple
+
+Entity = Tuple[int, int, int, int]
+Snapshot = Dict[int, Entity]
+
+KIND_PLAYER = 0
+KIND_MOB = 1
+KIND_BULLET = 2
+KIND_POW_GUN = 3
+KIND_POW_SHIELD = 4
+KIND_EXPLOSION_LG = 5
+KIND_EXPLOSION_SM = 6
+KIND_EXPLOSION_PLAYER = 7
+
+FRAME_KEY = 0
+FRAME_DELTA = 1
+
+FLAG_ZLIB = 1
+
+# flags, frame type, tick, score, health, lives, spawned, updated, killed
+_HEADER = struct.Struct("<BBIiiiIII")
+# id, kind, x, y, extra
+_SPAWN = struct.Struct("<IBhhH")
+# id, x, y, extra
+_UPDATE = struct.Struct("<IhhH")
+_KILL = struct.Struct("<I")
+_LENGTH = struct.Struct("<I")
+
+
+class StateEncoder:
+    """Encode game snapshots to delta compressed binary frames
+
+    Every entity is a (kind, x, y, extra) tuple keyed by a stable id.
+    Delta frames carry only spawned, changed and killed entities, key
+    frames carry the whole scene and are emitted every keyframe_interval
+    frames so a late or desynced spectator can recover.
+    """
+
+    def __init__(self, keyframe_interval: int = 60, compress_level: int = 0) -> None:
+        self._keyframe_interval = keyframe_interval
+        self._compress_level = compress_level
+        self._previous: Snapshot = {}
+        self._since_keyframe = keyframe_interval
+
+    def encode(
+        self,
+        tick: int,
+        snapshot: Snapshot,
+        score: int,
+        health: int,
+        lives: int,
+        force_keyframe: bool = False,
+    ) -> bytes:
+        """Encode snapshot to the frame"""
+
+        if force_keyframe or self._since_keyframe >= self._keyframe_interval:
+            self._since_keyframe = 0
+            frame_type = FRAME_KEY
+
+            spawned = snapshot.items()
+            updated = ()
+            killed = ()
+        else:
+            frame_type = FRAME_DELTA
+            previous = self._previous
+
+            spawned = [
+                (key, entity) for key, entity in snapshot.items() if key not in previous
+            ]
+            updated = [
+                (key, entity)
+                for key, entity in snapshot.items()
+                if key in previous and previous[key] != entity
+            ]
+            killed = [key for key in previous if key not in snapshot]
+
+        self._since_keyframe += 1
+        self._previous = snapshot
+
+        spawn_pack = _SPAWN.pack
+        update_pack = _UPDATE.pack
+        kill_pack = _KILL.pack
+
+        body = b"".join(
+            [
+                b"".join([spawn_pack(key, *entity) for key, entity in spawned]),
+                b"".join(
+                    [update_pack(key, x, y, extra) for key, (_, x, y, extra) in updated]
+                ),
+                b"".join([kill_pack(key) for key in killed]),
+            ]
+        )
+
+        flags = 0
+
+        if self._compress_level:
+            flags |= FLAG_ZLIB
+            body = zlib.compress(body, self._compress_level)
+
+        header = _HEADER.pack(
+            flags,
+            frame_type,
+            tick,
+            score,
+            health,
+            lives,
+            len(spawned),
+            len(updated),
+            len(killed),
+        )
+
+        return header + body
+
+
+class StateDecoder:
+    """Rebuild the game scene from the frames"""
+
+    def __init__(self) -> None:
+        self.entities: Snapshot = {}
+        self.tick = 0
+        self.score = 0
+        self.health = 0
+        self.lives = 0
+        self.is_synced = False
+
+    def decode(self, frame: bytes) -> bool:
+        """Apply frame to the scene, return False if frame was skipped"""
+
+        (
+            flags,
+            frame_type,
+            tick,
+            score,
+            health,
+            lives,
+            spawned,
+            updated,
+            killed,
+        ) = _HEADER.unpack_from(frame)
+
+        if frame_type == FRAME_DELTA and not self.is_synced:
+            return False
+
+        body = frame[_HEADER.size :]
+
+        if flags & FLAG_ZLIB:
+            body = zlib.decompress(body)
+
+        if frame_type == FRAME_KEY:
+            self.entities = {}
+            self.is_synced = True
+
+        entities = self.entities
+        offset = 0
+
+        for key, kind, x, y, extra in _SPAWN.iter_unpack(
+            body[offset : offset + spawned * _SPAWN.size]
+        ):
+            entities[key] = (kind, x, y, extra)
+        offset += spawned * _SPAWN.size
+
+        for key, x, y, extra in _UPDATE.iter_unpack(
+            body[offset : offset + updated * _UPDATE.size]
+        ):
+            entities[key] = (entities[key][0], x, y, extra)
+        offset += updated * _UPDATE.size
+
+        for (key,) in _KILL.iter_unpack(body[offset : offset + killed * _KILL.size]):
+            entities.pop(key, None)
+
+        self.tick = tick
+        self.score = score
+        self.health = health
+        self.lives = lives
+
+        return True
+
+
+class FrameReader:
+    """Split length prefixed byte stream to the frames"""
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+
+    def feed(self, data: bytes) -> Iterator[bytes]:
+        """Feed received bytes, yield complete frames"""
+
+        self._buffer += data
+
+        while len(self._buffer) >= _LENGTH.size:
+            (length,) = _LENGTH.unpack_from(self._buffer)
+            end = _LENGTH.size + length
+
+            if len(self._buffer) < end:
+                break
+
+            frame = bytes(self._buffer[_LENGTH.size : end])
+            del self._buffer[:end]
+
+            yield frame
+
+
+class StatePublisher:
+    """Stream game state to the spectator over unix socket
+
+    Frames are queued to the bounded queue and sent by the background
+    thread, when spectator is slow the frame is dropped and the next one
+    is forced to be a keyframe, so the game loop never waits for it.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        queue_size: int = 8,
+        keyframe_interval: int = 60,
+        compress_level: int = 0,
+    ) -> None:
+        self._path = path
+        self._encoder = StateEncoder(keyframe_interval, compress_level)
+        self._queue: "queue.Queue[bytes]" = queue.Queue(maxsize=queue_size)
+
+        self._ids: "weakref.WeakKeyDictionary[object, int]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._next_id = count(1)
+
+        self._is_connected = threading.Event()
+        self._keyframe_requested = threading.Event()
+        self._stop_event = threading.Event()
+
+        self.sent_frames = 0
+        self.dropped_frames = 0
+        self.sent_bytes = 0
+
+        self._server = self._create_server()
+        self._thread = threading.Thread(
+            target=self._serve, name="state-publisher", daemon=True
+        )
+        self._thread.start()
+
+    def _create_server(self) -> socket.socket:
+        """Create listening unix socket"""
+
+        self._remove_socket()
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self._path)
+        server.listen(1)
+        server.settimeout(0.25)
+
+        return server
+
+    def entity_id(self, entity: object) -> int:
+        """Get stable stream id of the entity"""
+
+        entity_id = self._ids.get(entity)
+
+        if entity_id is None:
+            entity_id = self._ids[entity] = next(self._next_id) & 0xFFFFFFFF
+
+        return entity_id
+
+    @property
+    def is_connected(self) -> bool:
+        """Is spectator connected"""
+
+        return self._is_connected.is_set()
+
+    def publish(
+        self, tick: int, snapshot: Snapshot, score: int, health: int, lives: int
+    ) -> None:
+        """Encode and enqueue frame, never blocks"""
+
+        if not self._is_connected.is_set():
+            return
+
+        force_keyframe = self._keyframe_requested.is_set()
+        self._keyframe_requested.clear()
+
+        frame = self._encoder.encode(
+            tick, snapshot, score, health, lives, force_keyframe
+        )
+
+        try:
+            self._queue.put_nowait(_LENGTH.pack(len(frame)) + frame)
+        except queue.Full:
+            self.dropped_frames += 1
+            self._keyframe_requested.set()
+
+    def _drain_queue(self) -> None:
+        """Drop all queued frames"""
+
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                return
+
+    def _serve(self) -> None:
+        """Accept spectators and send them queued frames"""
+
+        while not self._stop_event.is_set():
+            try:
+                client, _ = self._server.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+
+            self._drain_queue()
+            self._keyframe_requested.set()
+            self._is_connected.set()
+
+            try:
+                self._send_frames(client)
+            except OSError:
+                pass
+            finally:
+                self._is_connected.clear()
+                client.close()
+
+    def _send_frames(self, client: socket.socket) -> None:
+        """Send queued frames until spectator disconnects"""
+
+        while not self._stop_event.is_set():
+            try:
+                data = self._queue.get(timeout=0.25)
+            except queue.Empty:
+                continue
+
+            client.sendall(data)
+
+            self.sent_frames += 1
+            self.sent_bytes += len(data)
+
+    def close(self, timeout: Optional[float] = 1.0) -> None:
+        """Stop publisher and remove the socket"""
+
+        self._stop_event.set()
+        self._thread.join(timeout)
+        self._server.close()
+        self._remove_socket()
+
+    def _remove_socket(self) -> None:
+        """Remove stale socket at the path, refuse to remove anything else"""
+
+        try:
+            mode = os.stat(self._path).st_mode
+        except FileNotFoundError:
+            return
+
+        if not stat.S_ISSOCK(mode):
+            raise FileExistsError(
+                "Stream path {!r} exists and is not a socket".format(self._path)
+            )
+
+        os.unlink(self._path)
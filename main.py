@@ -1,6 +1,29 @@
+import os
+
 from core.game import Game
 
+MEMORY_BUDGET_MIB = os.environ.get("SPACERUSH_MEMORY_BUDGET_MIB")
+
 if __name__ == "__main__":
-    game = Game(1000, 800, "Space rush!", 60, mobs_count=10, lives=3)
+    game = Game(
+        1000,
+        800,
+        "Space rush!",
+        60,
+        mobs_count=10,
+        lives=3,
+        stream_path=os.environ.get("SPACERUSH_STREAM"),
+        pacing=os.environ.get("SPACERUSH_PACING", "hybrid"),
+        pacing_report_path=os.environ.get("SPACERUSH_PACING_REPORT"),
+        memory_budget=(
+            int(float(MEMORY_BUDGET_MIB) * 1024 * 1024) if MEMORY_BUDGET_MIB else None
+        ),
+        memory_report_path=os.environ.get("SPACERUSH_MEMORY_REPORT"),
+        restart_on_game_over=os.environ.get("SPACERUSH_KIOSK") == "1",
+        renderer=os.environ.get("SPACERUSH_RENDERER", "surface"),
+        profile_dir=os.environ.get("SPACERUSH_PROFILE_DIR", "profiles"),
+        profile_frames=int(os.environ.get("SPACERUSH_PROFILE", 0)),
+        culling=os.environ.get("SPACERUSH_CULLING") != "0",
+    )
 
     game.start()
@@ -9,7 +9,6 @@ class Bullet(Sprite):
         super().__init__()
 
         self.image = bullet_img
-        self.image.set_colorkey((0, 0, 0))
 
         self.rect = self.image.get_rect()
 
@@ -1,6 +1,6 @@
 from pygame.sprite import Sprite
 from pygame import Surface
-from typing import Tuple, Dict, List
+from typing import Tuple, Dict, List, Optional
 
 import pygame
 
@@ -13,19 +13,26 @@ class Explosion(Sprite):
         center: Tuple[int, int],
         size: str,
         explosion_images: Dict[str, List[Surface]],
+        explosion_offsets: Optional[Dict[str, List[Tuple[int, int]]]] = None,
     ) -> None:
         super().__init__()
 
         self.size = size
-        self.image = explosion_images[self.size][0]
-
-        self.rect = self.image.get_rect()
-        self.rect.center = center
+        self.explosions_images = explosion_images
+        self._explosion_offsets = explosion_offsets
+        self._center = center
 
         self._frame = 0
         self._last_frame = pygame.time.get_ticks()
         self._frame_rate = 50
-        self.explosions_images = explosion_images
+
+        self._next_frame()
+
+    @property
+    def frame(self) -> int:
+        """Current frame index"""
+
+        return self._frame
 
     def _is_last_frame(self):
         """Is explosion in the last frame"""
@@ -35,10 +42,12 @@ class Explosion(Sprite):
     def _next_frame(self):
         """Next explosion frame"""
 
-        center = self.rect.center
         self.image = self.explosions_images[self.size][self._frame]
         self.rect = self.image.get_rect()
-        self.rect.center = center
+        self.rect.center = self._center
+
+        if self._explosion_offsets:
+            self.rect.move_ip(self._explosion_offsets[self.size][self._frame])
 
     def _animate(self) -> None:
         """Animate frame"""
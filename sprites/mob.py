@@ -1,22 +1,56 @@
 from pygame.sprite import Sprite
 from pygame import Surface
-from typing import Tuple
+from typing import Optional, Tuple, TYPE_CHECKING
+import math
 import random
 import pygame
 
+if TYPE_CHECKING:
+    from core.memory import SurfaceCache
+
+
+def rotated_size(width: int, height: int, angle: float) -> Tuple[int, int]:
+    """Get size of the image rotated by pygame.transform.rotate"""
+
+    if not math.fmod(angle, 90):
+        return (width, height) if int(angle // 90) % 2 == 0 else (height, width)
+
+    radians = math.radians(angle)
+    sin = math.sin(radians)
+    cos = math.cos(radians)
+
+    cx, cy, sx, sy = cos * width, cos * height, sin * width, sin * height
+
+    return (
+        int(max(abs(cx + sy), abs(cx - sy), abs(-cx + sy), abs(-cx - sy))),
+        int(max(abs(sx + cy), abs(sx - cy), abs(-sx + cy), abs(-sx - cy))),
+    )
+
 
 class Mob(Sprite):
     """Mob sprite"""
 
-    def __init__(self, window_w: int, window_h: int, mob_img: Surface) -> None:
+    def __init__(
+        self,
+        window_w: int,
+        window_h: int,
+        mob_img: Surface,
+        rotation_cache: Optional["SurfaceCache"] = None,
+        rotate_image: bool = True,
+        viewport: Optional[pygame.Rect] = None,
+    ) -> None:
         super().__init__()
 
         self.window_w = window_w
         self.window_h = window_h
 
         self.image_orig = mob_img
+        self._rotation_cache = rotation_cache
+        self._rotate_image_enabled = rotate_image
+        self._viewport = viewport
 
-        self.image = self.image_orig.copy()
+        # image is never drawn on, so the original can be shared
+        self.image = self.image_orig
         self.rect = self.image.get_rect()
 
         self.speedy = self._get_random_speed(4, 8)
@@ -25,11 +59,20 @@ class Mob(Sprite):
         self._set_coords(*self._get_random_coords())
 
         self.rot = 0
+        self.render_angle = 0
         self.rot_speed = random.randrange(-8, 8)
         self.last_update = pygame.time.get_ticks()
 
         self.radius = int(self.rect.width * 0.85 / 2)
 
+        # sleeping mob is out of the viewport and its image is not rotated
+        self.sleeping = self._is_offscreen()
+
+    def _is_offscreen(self) -> bool:
+        """Is mob out of the viewport"""
+
+        return self._viewport is not None and not self._viewport.colliderect(self.rect)
+
     def _get_random_coords(self) -> Tuple[int, int]:
         """Get random coords"""
 
@@ -49,6 +92,32 @@ class Mob(Sprite):
         self.rect.x = x
         self.rect.y = y
 
+    def _rotate_image(self) -> Surface:
+        """Rotate original image by current angle"""
+
+        new_image = pygame.transform.rotate(self.image_orig, self.rot)
+        colorkey = self.image_orig.get_colorkey()
+
+        if colorkey is not None:
+            new_image.set_colorkey(colorkey, pygame.RLEACCEL)
+
+        return new_image
+
+    def _get_rotated_image(self) -> Surface:
+        """Get image rotated by current angle"""
+
+        if self._rotation_cache is None:
+            return self._rotate_image()
+
+        key = (self.image_orig, self.rot)
+        new_image = self._rotation_cache.get(key)
+
+        if new_image is None:
+            new_image = self._rotate_image()
+            self._rotation_cache.put(key, new_image)
+
+        return new_image
+
     def rotate(self):
         """Rotate mob"""
 
@@ -58,12 +127,21 @@ class Mob(Sprite):
             self.last_update = now
             self.rot = (self.rot + self.rot_speed) % 360
 
-            new_image = pygame.transform.rotate(self.image_orig, self.rot)
-
             old_center = self.rect.center
 
-            self.image = new_image
-            self.rect = self.image.get_rect()
+            if self._rotate_image_enabled and not self.sleeping:
+                self.image = self._get_rotated_image()
+                self.rect = self.image.get_rect()
+            else:
+                # renderer rotates the original image or the mob is not
+                # drawn at all, only the rect follows
+                if not self._rotate_image_enabled:
+                    self.render_angle = self.rot
+
+                self.rect = pygame.Rect(
+                    (0, 0), rotated_size(*self.image_orig.get_size(), self.rot)
+                )
+
             self.rect.center = old_center
 
     def update(self) -> None:
@@ -80,3 +158,16 @@ class Mob(Sprite):
             self._set_coords(*self._get_random_coords())
             self.speedy = self._get_random_speed(1, 8)
             self.speedx = self._get_random_speed(-3, 3)
+
+        self._update_sleeping()
+
+    def _update_sleeping(self) -> None:
+        """Sleep out of the viewport, rotate image on wake up"""
+
+        was_sleeping = self.sleeping
+        self.sleeping = self._is_offscreen()
+
+        if was_sleeping and not self.sleeping and self._rotate_image_enabled:
+            center = self.rect.center
+            self.image = self._get_rotated_image()
+            self.rect = self.image.get_rect(center=center)
@@ -2,10 +2,13 @@ import pygame.time
 
 from pygame.sprite import Sprite
 from pygame import Surface
-from pygame import key as pygame_key
+from typing import Optional, TYPE_CHECKING
 
 from pygame import K_LEFT, K_RIGHT
 
+if TYPE_CHECKING:
+    from core.controls import InputState
+
 
 class Player(Sprite):
     """Player sprite"""
@@ -36,6 +39,21 @@ class Player(Sprite):
         self.is_double_shot = False
         self._double_shot_timer = pygame.time.get_ticks()
 
+        self._input_state: Optional["InputState"] = None
+
+    def set_input(self, input_state: "InputState") -> None:
+        """Set input state for the next update"""
+
+        self._input_state = input_state
+
+    def _is_moving(self, key: int) -> bool:
+        """Is move key held or tapped"""
+
+        if self._input_state is None:
+            return False
+
+        return self._input_state.is_held(key) or self._input_state.is_pressed(key)
+
     def _move(self) -> None:
         """Move player with speed"""
 
@@ -58,6 +76,11 @@ class Player(Sprite):
         self.is_double_shot = True
         self._double_shot_timer = pygame.time.get_ticks()
 
+    def is_hidden(self) -> bool:
+        """Is player hidden after death"""
+
+        return self._hidden
+
     def hide(self) -> None:
         """Hide player"""
 
@@ -89,11 +112,9 @@ class Player(Sprite):
         self._disable_double_shoot()
         self.speed = 0
 
-        keys_pressed = pygame_key.get_pressed()
-
-        if keys_pressed[K_LEFT]:
+        if self._is_moving(K_LEFT):
             self.speed = -8
-        if keys_pressed[K_RIGHT]:
+        if self._is_moving(K_RIGHT):
             self.speed = 8
 
         self._move()
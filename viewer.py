@@ -0,0 +1,101 @@
+import socket
+import sys
+
+import pygame
+
+from core import stream
+
+SIZES = {
+    stream.KIND_PLAYER: (50, 38),
+    stream.KIND_MOB: (50, 45),
+    stream.KIND_BULLET: (10, 54),
+    stream.KIND_POW_GUN: (48, 28),
+    stream.KIND_POW_SHIELD: (25, 22),
+    stream.KIND_EXPLOSION_LG: (75, 75),
+    stream.KIND_EXPLOSION_SM: (32, 32),
+    stream.KIND_EXPLOSION_PLAYER: (100, 100),
+}
+
+COLORS = {
+    stream.KIND_PLAYER: (0, 0, 255),
+    stream.KIND_MOB: (160, 160, 160),
+    stream.KIND_BULLET: (255, 255, 0),
+    stream.KIND_POW_GUN: (0, 255, 255),
+    stream.KIND_POW_SHIELD: (255, 0, 255),
+    stream.KIND_EXPLOSION_LG: (255, 128, 0),
+    stream.KIND_EXPLOSION_SM: (255, 128, 0),
+    stream.KIND_EXPLOSION_PLAYER: (255, 0, 0),
+}
+
+
+def render(screen: pygame.Surface, font: pygame.font.Font, decoder) -> None:
+    """Render rebuilt scene"""
+
+    screen.fill((0, 0, 0))
+
+    for kind, x, y, extra in decoder.entities.values():
+        rect = pygame.Rect((0, 0), SIZES[kind])
+        rect.center = (x, y)
+
+        if kind >= stream.KIND_EXPLOSION_LG:
+            pygame.draw.circle(
+                screen, COLORS[kind], rect.center, rect.width // 2 - extra * 3, 1
+            )
+        else:
+            pygame.draw.rect(screen, COLORS[kind], rect, 1)
+
+    info = "tick: {} score: {} health: {} lives: {} entities: {}".format(
+        decoder.tick,
+        decoder.score,
+        decoder.health,
+        decoder.lives,
+        len(decoder.entities),
+    )
+    screen.blit(font.render(info, True, (255, 255, 255)), (5, 5))
+
+    pygame.display.flip()
+
+
+def main(path: str, width: int = 1000, height: int = 800) -> None:
+    """Connect to the game and render the stream"""
+
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.connect(path)
+    client.setblocking(False)
+
+    pygame.init()
+    screen = pygame.display.set_mode((width, height))
+    pygame.display.set_caption("Space rush! spectator")
+    font = pygame.font.Font(pygame.font.match_font("arial"), 16)
+    clock = pygame.time.Clock()
+
+    reader = stream.FrameReader()
+    decoder = stream.StateDecoder()
+    is_running = True
+
+    while is_running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                is_running = False
+
+        try:
+            data = client.recv(1 << 16)
+        except BlockingIOError:
+            data = None
+
+        if data == b"":
+            break
+
+        if data:
+            for frame in reader.feed(data):
+                decoder.decode(frame)
+
+        render(screen, font, decoder)
+        clock.tick(60)
+
+    client.close()
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else "/tmp/spacerush.sock")